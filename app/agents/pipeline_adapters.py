@@ -0,0 +1,87 @@
+# app/agents/pipeline_adapters.py
+"""Adapters for calling the agent pipeline with in-memory resume text.
+
+``run_agentic_pipeline`` reads the resume from ``resume_text_path``. Rather
+than routing every caller through one shared file on disk, these helpers
+give each run its own short-lived file, so concurrent users can never read
+each other's resume. ``run_pipeline_single_flight`` also coalesces identical
+requests made from different server processes.
+
+``resume_sections`` in the pipeline input gives the ``[section, start, end]``
+character spans of the experience, skills and education sections in that
+file. The orchestrator can then read it chunk by chunk with
+``resume_stream.iter_section_chunks`` instead of loading one large string.
+
+The orchestrator pulls in the LLM clients, so it is imported on the first
+run rather than with this module (see ``app.services.warmup``).
+"""
+import os
+import tempfile
+
+from app.services.admission import key_lock
+from app.services.job_manager import check_cancelled
+from app.services.result_cache import analysis_cache
+from app.services.resume_stream import split_sections
+from app.services.skill_normalizer import get_normalizer
+from app.services.tracing import span
+
+
+def build_pipeline_input(profile: dict, target_role: str, current_skills: list, target_skills: list,
+                         learning_mode: str, motivation: str, timeframe: str, resume_text: str) -> dict:
+    """Pipeline input for a target profile, with skills mapped onto the taxonomy."""
+    normalizer = get_normalizer()
+    return {
+        "role": profile.get("current_role", ""),  # ✅ current role from profile
+        "target_role": target_role,
+        "current_skills": normalizer.canonicalize_all(current_skills),
+        "target_skills": normalizer.canonicalize_all(target_skills),
+        "resume_skills": normalizer.extract_skills(resume_text),
+        "resume_sections": split_sections(resume_text),
+        "experience": profile.get("experience", "N/A"),  # ✅ ensure experience is passed
+        "learning_mode": learning_mode,
+        "motivation": motivation,
+        "timeframe": timeframe,
+    }
+
+
+def run_pipeline_on_text(pipeline_input: dict, resume_text: str, **kwargs):
+    """Run the pipeline on ``resume_text`` without touching any shared path."""
+    from app.agents.orchestrator import run_agentic_pipeline
+
+    fd, path = tempfile.mkstemp(prefix="resume_", suffix=".txt")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(resume_text)
+        with span("orchestrator.run_agentic_pipeline"):
+            return run_agentic_pipeline(pipeline_input, resume_text_path=path, **kwargs)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def run_pipeline_single_flight(cache_key: str, pipeline_input: dict, resume_text: str,
+                               refresh: bool = False, cache_checked: bool = False, **kwargs):
+    """Run the pipeline at most once per ``cache_key`` across all server processes.
+
+    Identical requests serialize on a host-wide lock; whoever runs second
+    finds the first run's result in the analysis cache and returns it. Callers
+    that also hold a pipeline slot should take ``key_lock(cache_key)`` before
+    the slot (``submit_job(..., lock_key=cache_key)`` does); the lock is
+    re-entrant, so it is not taken twice. Callers that have just missed the
+    analysis cache pass ``cache_checked=True``, so the re-check made after
+    taking the lock doesn't count the same request twice in the cache stats. When
+    called from a job that was cancelled, the result is not cached and
+    ``JobCancelled`` is raised.
+    """
+    with key_lock(cache_key, on_wait=check_cancelled):
+        if not refresh:
+            cached = analysis_cache.get(cache_key, count=not cache_checked)
+            if cached is not None:
+                return cached
+        context = run_pipeline_on_text(pipeline_input, resume_text, **kwargs)
+        # A run cancelled while the pipeline was busy is dropped, not cached
+        check_cancelled()
+        analysis_cache.set(cache_key, context)
+        return context
@@ -0,0 +1,237 @@
+# app/agents/stage_graph.py
+"""Dependency-graph executor for agent pipeline stages.
+
+A pipeline is declared as a set of ``Stage`` objects, each naming the stages
+whose output it reads. ``StageGraph.run`` starts every stage as soon as its
+dependencies have finished, so independent agents (for example resume
+profile extraction and target-role skill requirements) run side by side.
+End-to-end latency then follows the critical path instead of the sum of all
+stages. Concurrency is capped per run, and each stage can have its own
+timeout.
+
+Stage functions take the shared context dict, which holds the pipeline input
+plus the output of every finished stage under its stage name, and return
+their own output.
+
+A stage that declares ``reads`` (the pipeline input fields it uses) is
+memoized when ``run`` is given a cache. Its key covers only those fields plus
+the keys of its upstream stages. When a user changes only the timeframe or
+learning mode, the resume profile and skill-gap stages are reused and just
+the stages that read those fields run again. A stage is only reused when
+every stage it depends on was reused as well. Outputs that aren't plain JSON
+are not memoized.
+
+``iter_run`` yields each stage's result as soon as it is available, so
+callers can show partial analysis before the whole pipeline finishes.
+
+Stage threads run in a copy of the caller's context, so a stage reports
+progress to and is cancelled with the job that runs the pipeline. When a run
+ends early (a stage failed or timed out, the job was cancelled, or the
+generator was closed), the stages still running are told to stop at their
+next ``check_cancelled``. The run returns without waiting for them, so a
+stage stuck in a blocking model call can't hold up the run past its timeout.
+Such a stage finishes in the background and its output is discarded.
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from app.services.job_manager import (
+    JobCancelled, check_cancelled, report_partial, report_progress, run_abandonable
+)
+from app.services.result_cache import ResultCache, key_inputs, stable_hash
+from app.services.tracing import span
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+MAX_STAGE_CONCURRENCY = int(os.environ.get("PIPELINE_MAX_STAGE_CONCURRENCY", "4"))
+DEFAULT_STAGE_TIMEOUT = float(os.environ.get("PIPELINE_STAGE_TIMEOUT", "180"))
+CANCEL_POLL_SECONDS = 0.5
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+class StageError(RuntimeError):
+    def __init__(self, stage: str, message: str):
+        super().__init__(f"Stage '{stage}' {message}")
+        self.stage = stage
+
+
+class StageTimeoutError(StageError):
+    pass
+
+
+# ============================================================================
+# GRAPH
+# ============================================================================
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable[[dict], Any]
+    depends_on: tuple = ()
+    timeout: Optional[float] = None
+    label: Optional[str] = None
+    reads: Optional[tuple] = None
+
+
+@dataclass(frozen=True)
+class StageResult:
+    stage: str
+    output: Any
+    reused: bool = False
+    elapsed: float = 0.0
+
+
+def _run_stage(stage: Stage, context: dict, abandoned: threading.Event):
+    with span(f"stage.{stage.name}"):
+        return run_abandonable(abandoned, stage.fn, context)
+
+
+class StageGraph:
+    def __init__(self, stages):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        for stage in stages:
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+        self.order = self._topological_order()
+
+    def stage_keys(self, context: dict) -> dict:
+        """Memoization key per stage; ``None`` for stages that don't declare ``reads``.
+
+        A key is only defined when every upstream stage has one too. Keys
+        don't cover upstream outputs, so ``iter_run`` only reuses a stage when
+        all its upstream stages were reused in the same run.
+        """
+        keys: dict = {}
+        for name in self.order:
+            stage = self.stages[name]
+            upstream = [keys[dep] for dep in stage.depends_on]
+            if stage.reads is None or None in upstream:
+                keys[name] = None
+                continue
+            inputs = key_inputs({field: context.get(field) for field in stage.reads})
+            keys[name] = stable_hash(name, inputs, upstream)
+        return keys
+
+    def _topological_order(self) -> list:
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def iter_run(self, context: dict, max_concurrency: int = MAX_STAGE_CONCURRENCY,
+                 default_timeout: Optional[float] = DEFAULT_STAGE_TIMEOUT,
+                 cache: Optional[ResultCache] = None, refresh: bool = False) -> Iterator[StageResult]:
+        """Run every stage, yielding a ``StageResult`` as each one finishes.
+
+        Each output is also written into ``context`` and published as a partial
+        result of the calling job. With a ``cache``, memoizable stages whose key
+        is already stored are yielded straight away without running;
+        ``refresh`` recomputes them anyway and overwrites the cache. Closing
+        the generator early cancels stages that have not started yet and
+        tells the running ones to stop.
+        """
+        pending = list(self.order)
+        completed = set()
+        running: dict = {}
+        keys = self.stage_keys(context) if cache is not None else {}
+
+        if cache is not None and not refresh:
+            for name in list(pending):
+                # An upstream stage that has to run again (evicted, never cached, or
+                # uncacheable) may produce a different output, so its dependents run too
+                if keys[name] is None or not all(dep in completed for dep in self.stages[name].depends_on):
+                    continue
+                output = cache.get(keys[name])
+                if output is not None:
+                    context[name] = output
+                    completed.add(name)
+                    pending.remove(name)
+                    report_progress(f"Reusing previous {name} results", stage=name)
+                    report_partial(name, output)
+                    yield StageResult(name, output, reused=True)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="pipeline-stage")
+        abandoned = threading.Event()
+        try:
+            while pending or running:
+                check_cancelled()
+
+                # Start every stage whose dependencies are done, up to the concurrency cap
+                for name in list(pending):
+                    if len(running) >= max_concurrency:
+                        break
+                    stage = self.stages[name]
+                    if all(dep in completed for dep in stage.depends_on):
+                        pending.remove(name)
+                        report_progress(stage.label or f"Running {name}...", stage=name)
+                        timeout = stage.timeout if stage.timeout is not None else default_timeout
+                        started = time.monotonic()
+                        deadline = started + timeout if timeout else None
+                        future = executor.submit(
+                            contextvars.copy_context().run, _run_stage, stage, dict(context), abandoned
+                        )
+                        running[future] = (stage, started, deadline)
+
+                if not running:
+                    raise ValueError(f"Stages cannot start: {pending}")
+
+                # Wake up at least every CANCEL_POLL_SECONDS to notice cancellation
+                wait_for = CANCEL_POLL_SECONDS
+                deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+                if deadlines:
+                    wait_for = min(wait_for, max(0.0, min(deadlines) - time.monotonic()))
+                finished, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    stage, started, _ = running.pop(future)
+                    try:
+                        output = future.result()
+                    except JobCancelled:
+                        raise
+                    except Exception as e:
+                        raise StageError(stage.name, f"failed: {e}") from e
+                    context[stage.name] = output
+                    completed.add(stage.name)
+                    if keys.get(stage.name) is not None:
+                        cache.set(keys[stage.name], output)
+                    report_partial(stage.name, output)
+                    yield StageResult(stage.name, output, elapsed=time.monotonic() - started)
+
+                now = time.monotonic()
+                for stage, _, deadline in running.values():
+                    if deadline is not None and deadline <= now:
+                        raise StageTimeoutError(stage.name, "timed out")
+        finally:
+            if running:
+                abandoned.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, context: dict, **kwargs) -> dict:
+        """Run every stage to completion and return ``context``; see ``iter_run``."""
+        for _ in self.iter_run(context, **kwargs):
+            pass
+        return context
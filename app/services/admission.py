@@ -0,0 +1,158 @@
+# app/services/admission.py
+"""Host-wide admission control for pipeline runs.
+
+Every server process on the host shares a fixed number of pipeline slots,
+implemented as lock files under ``LOCK_DIR``. A run holds an exclusive
+``flock`` on one slot file for its whole duration. The kernel releases the
+lock if the process dies, so a crashed worker can never leak a slot.
+
+``key_lock`` uses the same mechanism to serialize identical requests across
+processes. The second request waits for the first and can then reuse its
+cached result instead of running again. Callers take it before a pipeline
+slot, so a request waiting for an identical run never sits on a slot. Keys
+are hashed onto a fixed set of
+``KEY_LOCK_BUCKETS`` lock files, so the lock directory doesn't grow with every
+distinct request. Two different keys that share a bucket just run one after
+the other.
+"""
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX hosts fall back to per-process limits
+    fcntl = None
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+LOCK_DIR = os.environ.get("ADMISSION_LOCK_DIR", "data/locks")
+MAX_CONCURRENT_PIPELINES = int(os.environ.get("MAX_CONCURRENT_PIPELINES", "4"))
+KEY_LOCK_BUCKETS = int(os.environ.get("ADMISSION_KEY_LOCK_BUCKETS", "64"))
+POLL_SECONDS = 0.25
+
+
+def _open_lock_file(name: str):
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    return open(os.path.join(LOCK_DIR, name), "a+")
+
+
+# ============================================================================
+# SLOTS
+# ============================================================================
+class PipelineSlots:
+    def __init__(self, name: str, slots: int):
+        self.name = name
+        self.slots = max(1, slots)
+        self._local = threading.BoundedSemaphore(self.slots)
+
+    def _try_acquire_file(self):
+        for index in range(self.slots):
+            handle = _open_lock_file(f"{self.name}-{index}.lock")
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except OSError:
+                handle.close()
+        return None
+
+    @contextmanager
+    def acquire(self, on_wait: Optional[Callable[[], None]] = None):
+        """Hold one slot for the duration of the block.
+
+        ``on_wait`` is called every poll interval while all slots are busy; it
+        may raise to give up waiting (for example when the job is cancelled).
+        """
+        if fcntl is None:
+            while not self._local.acquire(timeout=POLL_SECONDS):
+                if on_wait:
+                    on_wait()
+            try:
+                yield
+            finally:
+                self._local.release()
+            return
+
+        handle = self._try_acquire_file()
+        while handle is None:
+            if on_wait:
+                on_wait()
+            time.sleep(POLL_SECONDS)
+            handle = self._try_acquire_file()
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            handle.close()
+
+
+_local_key_locks: dict = {}
+_local_key_locks_guard = threading.Lock()
+_held = threading.local()
+
+
+@contextmanager
+def key_lock(key: str, namespace: str = "key", on_wait: Optional[Callable[[], None]] = None):
+    """Exclusive host-wide lock for one request key.
+
+    Without ``on_wait`` this blocks until the lock is free. With it, the lock
+    is polled and ``on_wait`` is called every poll interval while it is held
+    elsewhere; it may raise to give up waiting, as in ``PipelineSlots.acquire``.
+
+    Each ``namespace`` has its own set of bucket files, so short profile
+    writes never queue behind long pipeline runs that share a bucket. The lock
+    is re-entrant within a thread: a nested ``key_lock`` on a bucket the thread
+    already holds doesn't wait for itself.
+    """
+    bucket = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % max(1, KEY_LOCK_BUCKETS)
+    held = _held.__dict__.setdefault("buckets", set())
+    if (namespace, bucket) in held:
+        yield
+        return
+    held.add((namespace, bucket))
+    try:
+        with _bucket_lock(namespace, bucket, on_wait):
+            yield
+    finally:
+        held.discard((namespace, bucket))
+
+
+@contextmanager
+def _bucket_lock(namespace: str, bucket: int, on_wait: Optional[Callable[[], None]]):
+    if fcntl is None:
+        with _local_key_locks_guard:
+            lock = _local_key_locks.setdefault((namespace, bucket), threading.Lock())
+        if on_wait is None:
+            lock.acquire()
+        else:
+            while not lock.acquire(timeout=POLL_SECONDS):
+                on_wait()
+        try:
+            yield
+        finally:
+            lock.release()
+        return
+    handle = _open_lock_file(f"{namespace}-{bucket}.lock")
+    try:
+        if on_wait is None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except OSError:
+                    on_wait()
+                    time.sleep(POLL_SECONDS)
+        yield
+    finally:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+
+pipeline_slots = PipelineSlots("pipeline", MAX_CONCURRENT_PIPELINES)
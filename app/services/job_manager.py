@@ -0,0 +1,275 @@
+# app/services/job_manager.py
+"""Background job runner for long-running analysis work.
+
+Jobs are submitted to a process-wide worker pool and tracked by id, so a
+Streamlit page can return immediately, poll for progress on later reruns and
+pick a job back up after a rerun or reconnect. Work running inside a job can
+publish partial results as they become available, and can check whether the
+user has cancelled it.
+
+A finished job stays listed for its owner until a page collects it with
+``discard_job``. A result that finishes while the user is on another page is
+therefore still delivered when they come back.
+
+Submissions carrying the same ``dedupe_key`` while a job is still in flight
+attach to that job instead of starting another. A job given a ``lock_key``
+first takes that host-wide ``admission.key_lock``, so identical runs in other
+processes finish first and unrelated jobs never wait on it while holding a
+slot. Jobs only start running once they hold one of the host-wide pipeline
+slots from ``admission``. Until then
+they stay queued, and their queue position is reported as progress. That
+position only counts jobs queued in this process; jobs waiting in other
+server processes on the host are not included.
+
+The running job is tracked in a context variable, so threads started with a
+copy of the job's context (such as pipeline stages) report to the same job.
+"""
+import contextvars
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+from contextlib import nullcontext
+
+from app.services.admission import key_lock, pipeline_slots
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+# Worker threads mostly wait for a pipeline slot; admission.MAX_CONCURRENT_PIPELINES
+# is what bounds the number of pipelines actually running
+MAX_WORKERS = int(os.environ.get("ANALYSIS_MAX_WORKERS", "32"))
+JOB_RETENTION_SECONDS = 15 * 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+# ============================================================================
+# JOB RECORD
+# ============================================================================
+@dataclass
+class Job:
+    job_id: str
+    owner: Optional[str]
+    status: str = QUEUED
+    events: list = field(default_factory=list)
+    partials: dict = field(default_factory=dict)
+    cancel_requested: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+    meta: dict = field(default_factory=dict)
+    dedupe_key: Optional[Hashable] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def latest_message(self) -> Optional[str]:
+        with _lock:
+            return self.events[-1]["message"] if self.events else None
+
+    def partial_results(self) -> dict:
+        with _lock:
+            return dict(self.partials)
+
+
+# ============================================================================
+# PROCESS-WIDE STATE
+# ============================================================================
+_lock = threading.Lock()
+_jobs: dict = {}
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="analysis-job")
+_current: contextvars.ContextVar = contextvars.ContextVar("current_job", default=None)
+_abandoned: contextvars.ContextVar = contextvars.ContextVar("abandoned_work", default=None)
+
+
+def _emit(job: Job, message: str, stage: Optional[str] = None):
+    with _lock:
+        job.events.append({"time": time.time(), "stage": stage, "message": message})
+
+
+def _prune_finished():
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    with _lock:
+        expired = [
+            job_id for job_id, job in _jobs.items()
+            if job.finished and job.finished_at and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del _jobs[job_id]
+
+
+def _wait_for_slot(job: Job, last_position: list):
+    check_cancelled()
+    position = queue_position(job)
+    if position != last_position[0]:
+        last_position[0] = position
+        _emit(job, f"Waiting for a free analysis slot (position {position} in queue)...", stage="queued")
+
+
+def _wait_for_key(job: Job, waiting: list):
+    check_cancelled()
+    if not waiting:
+        waiting.append(True)
+        _emit(job, "Waiting for a matching analysis that is already running...", stage="queued")
+
+
+def _run(job: Job, fn: Callable, args: tuple, kwargs: dict, lock_key: Optional[str]):
+    token = _current.set(job)
+    try:
+        last_position = [None]
+        waiting = []
+        with key_lock(lock_key, on_wait=lambda: _wait_for_key(job, waiting)) if lock_key else nullcontext(), \
+                pipeline_slots.acquire(on_wait=lambda: _wait_for_slot(job, last_position)):
+            check_cancelled()
+            job.status = RUNNING
+            _emit(job, "Analysis started", stage="start")
+            result = fn(*args, **kwargs)
+            # Work that never checks for cancellation still must not deliver a cancelled result
+            check_cancelled()
+            job.result = result
+        job.status = DONE
+        _emit(job, "Analysis complete", stage="done")
+    except JobCancelled:
+        job.status = CANCELLED
+        _emit(job, "Analysis cancelled", stage="cancelled")
+    except BaseException as e:
+        job.error = e
+        job.status = FAILED
+        _emit(job, f"Analysis failed: {e}", stage="failed")
+    finally:
+        job.finished_at = time.time()
+        _current.reset(token)
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+def submit_job(fn: Callable, *args, owner: Optional[str] = None, meta: Optional[dict] = None,
+               dedupe_key: Optional[Hashable] = None, lock_key: Optional[str] = None, **kwargs) -> str:
+    """Run ``fn(*args, **kwargs)`` on the worker pool and return the job id.
+
+    If an unfinished job with the same ``dedupe_key`` exists, its id is
+    returned and nothing new is started. ``lock_key`` is held with
+    ``admission.key_lock`` for the whole run, taken before the pipeline slot.
+    """
+    _prune_finished()
+    job = Job(job_id=uuid.uuid4().hex, owner=owner, meta=meta or {}, dedupe_key=dedupe_key)
+    with _lock:
+        if dedupe_key is not None:
+            for existing in _jobs.values():
+                if existing.dedupe_key == dedupe_key and not existing.finished:
+                    return existing.job_id
+        _jobs[job.job_id] = job
+    _emit(job, "Waiting for a free analysis worker...", stage="queued")
+    # Run in a copy of the caller's context, so the job's spans join the caller's trace
+    _executor.submit(contextvars.copy_context().run, _run, job, fn, args, kwargs, lock_key)
+    return job.job_id
+
+
+def get_job(job_id: Optional[str]) -> Optional[Job]:
+    if not job_id:
+        return None
+    with _lock:
+        return _jobs.get(job_id)
+
+
+def find_active_job(owner: Optional[str]) -> Optional[Job]:
+    """Return the owner's most recent job that no page has collected yet, if any.
+
+    That is a job still running, or one that finished without anyone polling
+    it, e.g. because the user had moved to another page.
+    """
+    if not owner:
+        return None
+    _prune_finished()
+    with _lock:
+        active = [job for job in _jobs.values() if job.owner == owner]
+    return max(active, key=lambda job: job.created_at) if active else None
+
+
+def queue_position(job: Job) -> int:
+    """1-based position of a queued job among this process's queued jobs.
+
+    Slots are shared host-wide but the queue is not, so with several server
+    processes this is a lower bound on how many runs are ahead of the job.
+    """
+    with _lock:
+        return 1 + sum(
+            1 for other in _jobs.values()
+            if other.status == QUEUED and other.created_at < job.created_at
+        )
+
+
+def report_progress(message: str, stage: Optional[str] = None):
+    """Record a progress event for the job running on the calling thread.
+
+    Pipeline stages call this to surface real progress to the page; outside a
+    job it is a no-op, so callers don't need to know how they were invoked.
+    """
+    job = _current.get()
+    if job is not None:
+        _emit(job, message, stage=stage)
+
+
+def report_partial(stage: str, output: Any):
+    """Publish a finished stage's output for the job on the calling thread."""
+    job = _current.get()
+    if job is not None:
+        with _lock:
+            job.partials[stage] = output
+
+
+def check_cancelled():
+    """Raise ``JobCancelled`` if the job on the calling thread was cancelled.
+
+    Also raises inside ``run_abandonable`` once the caller gave up on the work.
+    """
+    job = _current.get()
+    if job is not None and job.cancel_requested.is_set():
+        raise JobCancelled(job.job_id)
+    abandoned = _abandoned.get()
+    if abandoned is not None and abandoned.is_set():
+        raise JobCancelled(job.job_id if job is not None else None)
+
+
+def run_abandonable(abandoned: threading.Event, fn: Callable, *args, **kwargs):
+    """Run ``fn`` so that its ``check_cancelled`` calls raise once ``abandoned`` is set.
+
+    Used for helper threads whose caller may stop waiting for them, e.g. a
+    timed-out pipeline stage, so they stop at their next check.
+    """
+    token = _abandoned.set(abandoned)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _abandoned.reset(token)
+
+
+def cancel_job(job_id: Optional[str]):
+    """Ask a job to stop at its next cancellation check."""
+    job = get_job(job_id)
+    if job is not None and not job.finished:
+        job.cancel_requested.set()
+        _emit(job, "Cancelling analysis...", stage="cancelling")
+
+
+def discard_job(job_id: Optional[str]):
+    with _lock:
+        _jobs.pop(job_id, None)
@@ -0,0 +1,137 @@
+# app/services/profile_blobs.py
+"""Compressed out-of-line storage for large target profile fields.
+
+The parsed resume text and the analysis output dominate the size of a target
+profile, while most pages only need to know whether they exist. These fields
+are stored here as zlib-compressed JSON files, and the profile record keeps a
+small reference instead (``<field>_ref``). The reference holds the blob
+version and sizes, so presence checks never touch the blob itself.
+"""
+import hashlib
+import json
+import os
+import zlib
+from typing import Any, Optional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+BLOB_DIR = os.environ.get("PROFILE_BLOB_DIR", "data/profile_blobs")
+BLOB_FIELDS = ("resume_parsed_text", "analysis_output")
+
+
+def _user_dir(username: str) -> str:
+    return os.path.join(BLOB_DIR, hashlib.sha256(username.encode("utf-8")).hexdigest()[:24])
+
+
+def _blob_path(username: str, field: str, version: str) -> str:
+    return os.path.join(_user_dir(username), f"{field}-{version}.json.z")
+
+
+def ref_field(field: str) -> str:
+    return f"{field}_ref"
+
+
+# ============================================================================
+# BLOB I/O
+# ============================================================================
+def put_blob(username: str, field: str, value: Any) -> dict:
+    """Store ``value`` and return the reference to keep in the profile.
+
+    The version is derived from the content, so re-saving an unchanged field
+    produces the same reference and writes nothing. Raises ``TypeError`` or
+    ``ValueError`` if ``value`` isn't plain JSON.
+    """
+    raw = json.dumps(value, ensure_ascii=False).encode("utf-8")
+    version = hashlib.sha256(raw).hexdigest()[:16]
+    path = _blob_path(username, field, version)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(raw, 6))
+        os.replace(tmp_path, path)
+    ref = {"version": version, "size": len(raw)}
+    if isinstance(value, str):
+        ref["chars"] = len(value)
+    return ref
+
+
+def has_blob(username: str, field: str, ref: dict) -> bool:
+    return os.path.exists(_blob_path(username, field, ref["version"]))
+
+
+def get_blob(username: str, field: str, ref: dict) -> Any:
+    with open(_blob_path(username, field, ref["version"]), "rb") as f:
+        return json.loads(zlib.decompress(f.read()).decode("utf-8"))
+
+
+def prune_blobs(username: str, field: str, keep_version: Optional[str]):
+    """Remove stored versions of ``field`` other than ``keep_version``."""
+    user_dir = _user_dir(username)
+    if not os.path.isdir(user_dir):
+        return
+    keep = f"{field}-{keep_version}.json.z" if keep_version else None
+    for name in os.listdir(user_dir):
+        if name.startswith(f"{field}-") and name != keep:
+            try:
+                os.remove(os.path.join(user_dir, name))
+            except OSError:
+                pass
+
+
+# ============================================================================
+# PROFILE HELPERS
+# ============================================================================
+def externalize_fields(username: str, profile: dict) -> dict:
+    """Return a copy of ``profile`` with large inline fields moved to blobs.
+
+    A field left as ``None`` next to an existing reference is already stored
+    out of line and keeps that reference. A value that isn't plain JSON stays
+    inline, unchanged, for ``auth_manager`` to store as it always has.
+    """
+    stored = dict(profile)
+    for field in BLOB_FIELDS:
+        value = stored.get(field)
+        if value:
+            try:
+                ref = put_blob(username, field, value)
+            except (TypeError, ValueError):
+                stored[ref_field(field)] = None
+                continue
+            stored[field] = None
+            stored[ref_field(field)] = ref
+        elif field in stored and not stored.get(ref_field(field)):
+            stored[ref_field(field)] = None
+    return stored
+
+
+def inline_fields(username: str, profile: dict) -> dict:
+    """Inverse of ``externalize_fields``: large fields inline, references removed."""
+    stored = dict(profile)
+    for field in BLOB_FIELDS:
+        if ref_field(field) in stored:
+            ref = stored.pop(ref_field(field))
+            if ref and not stored.get(field):
+                stored[field] = get_blob(username, field, ref)
+    return stored
+
+
+def has_profile_field(profile: dict, field: str) -> bool:
+    """Cheap presence check that never loads the blob."""
+    return bool(profile.get(field) or profile.get(ref_field(field)))
+
+
+def load_profile_field(username: str, profile: dict, field: str) -> Any:
+    """Return ``field`` from ``profile``, fetching it from blob storage if needed.
+
+    Profiles saved before blob storage existed keep the value inline, and it is
+    returned as is.
+    """
+    if profile.get(field):
+        return profile[field]
+    ref = profile.get(ref_field(field))
+    if not ref:
+        return None
+    return get_blob(username, field, ref)
@@ -0,0 +1,264 @@
+# app/services/profile_cache.py
+"""Read-through / write-through cache in front of the target profile store.
+
+Two tiers sit in front of ``auth_manager``:
+
+* a per-session tier kept in the caller's session state, so repeated reruns
+  of a page never go back to the store, and
+* a short-lived process-wide tier shared across sessions, which absorbs
+  new sessions and reconnects for the same user.
+
+Saves go through to ``auth_manager`` and refresh both tiers, so a session
+always reads its own writes. Entries in both tiers expire after
+``SHARED_TTL_SECONDS``, so writes made by other processes (or by
+``cohort_analysis.py``) become visible to an open session within that time.
+
+``patch_target_profile`` applies field-level changes under a host-wide
+per-user lock and bumps a ``profile_version`` counter, so callers can detect
+that another tab saved in between their read and their write, even when the
+other tab (or ``cohort_analysis.py``) runs in another process.
+
+Large fields (resume text, analysis output) are moved to ``profile_blobs`` on
+save, so the cached and stored records only carry small references to them.
+The first save that carries these references (and ``profile_version``) reads
+the record back once. If ``auth_manager`` dropped the extra keys, the process
+goes back to storing the fields inline and stops checking versions.
+A save prunes the versions it replaced. Saves run under a host-wide lock per
+user, so a save from another server process or from ``cohort_analysis.py``
+never prunes a blob another save is about to reference. A save that still
+carries a reference to a pruned blob (written from a stale copy of the
+profile) keeps the reference of the stored record instead. A session holding
+an old profile reads large fields through ``load_profile_field``, which
+reloads the profile and retries when its reference has gone stale.
+"""
+import os
+import threading
+import time
+from typing import MutableMapping, Optional
+
+from app.services import auth_manager
+from app.services import profile_blobs
+from app.services.admission import key_lock
+from app.services.profile_blobs import (
+    BLOB_FIELDS, externalize_fields, has_blob, inline_fields, prune_blobs, ref_field
+)
+from app.services.tracing import span, traced
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+SHARED_TTL_SECONDS = float(os.environ.get("PROFILE_CACHE_TTL", "60"))
+SESSION_KEY = "_target_profile_cache"
+
+
+# ============================================================================
+# SHARED TIER
+# ============================================================================
+_lock = threading.Lock()
+_shared: dict = {}
+
+VERSION_FIELD = "profile_version"
+# None until the first save shows whether auth_manager keeps keys it doesn't know about
+_store_keeps_extra_keys: Optional[bool] = None
+
+
+def _shared_get(username: str) -> Optional[dict]:
+    with _lock:
+        entry = _shared.get(username)
+        if entry is None:
+            return None
+        expires_at, profile = entry
+        if expires_at < time.monotonic():
+            del _shared[username]
+            return None
+        return profile
+
+
+def _shared_put(username: str, profile: dict):
+    with _lock:
+        _shared[username] = (time.monotonic() + SHARED_TTL_SECONDS, profile)
+
+
+def _extra_keys(stored: dict) -> list:
+    keys = [ref_field(field) for field in BLOB_FIELDS if stored.get(ref_field(field))]
+    if VERSION_FIELD in stored:
+        keys.append(VERSION_FIELD)
+    return keys
+
+
+def _check_extra_keys(username: str, stored: dict) -> bool:
+    """Whether the store kept the blob references and version of ``stored``; probed once per process."""
+    global _store_keeps_extra_keys
+    if _store_keeps_extra_keys is None:
+        keys = _extra_keys(stored)
+        if not keys:
+            return True
+        with span("auth_manager.load_target_profile"):
+            saved = auth_manager.load_target_profile(username) or {}
+        _store_keeps_extra_keys = all(saved.get(key) == stored[key] for key in keys)
+    return _store_keeps_extra_keys
+
+
+def _session_get(tier: dict, username: str) -> Optional[dict]:
+    entry = tier.get(username)
+    if entry is None:
+        return None
+    expires_at, profile = entry
+    if expires_at < time.monotonic():
+        del tier[username]
+        return None
+    return profile
+
+
+def _session_put(tier: dict, username: str, profile: dict):
+    tier[username] = (time.monotonic() + SHARED_TTL_SECONDS, profile)
+
+
+def _session_tier(session: Optional[MutableMapping]) -> dict:
+    if session is None:
+        return {}
+    if SESSION_KEY not in session:
+        session[SESSION_KEY] = {}
+    return session[SESSION_KEY]
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+@traced("profile.load_target_profile")
+def load_target_profile(username: str, session: Optional[MutableMapping] = None) -> dict:
+    """Cached ``auth_manager.load_target_profile``.
+
+    Returns a shallow copy, so callers may reassign keys freely; list values
+    must be copied before being mutated in place.
+    """
+    tier = _session_tier(session)
+    profile = _session_get(tier, username)
+    if profile is None:
+        profile = _shared_get(username)
+        if profile is None:
+            with span("auth_manager.load_target_profile"):
+                profile = auth_manager.load_target_profile(username) or {}
+            _shared_put(username, profile)
+        _session_put(tier, username, profile)
+    return dict(profile)
+
+
+def _profile_lock(username: str):
+    return key_lock(f"profile:{username}", namespace="profile")
+
+
+def _keep_live_refs(username: str, stored: dict):
+    """Replace references to blobs a newer save already pruned with the stored record's."""
+    current = None
+    for field in BLOB_FIELDS:
+        ref = stored.get(ref_field(field))
+        if ref and not has_blob(username, field, ref):
+            if current is None:
+                with span("auth_manager.load_target_profile"):
+                    current = auth_manager.load_target_profile(username) or {}
+            kept = current.get(ref_field(field))
+            stored[ref_field(field)] = kept if kept and has_blob(username, field, kept) else None
+
+
+def _store(username: str, profile: dict):
+    """Write blobs and the record, then prune; callers hold ``_profile_lock``."""
+    if _store_keeps_extra_keys is False:
+        stored = inline_fields(username, profile)
+    else:
+        stored = externalize_fields(username, profile)
+        _keep_live_refs(username, stored)
+    with span("auth_manager.save_target_profile"):
+        success, message = auth_manager.save_target_profile(username, stored)
+    if success and not _check_extra_keys(username, stored):
+        # The references were dropped, so the blobs they point to are unreachable
+        stored = inline_fields(username, stored)
+        with span("auth_manager.save_target_profile"):
+            success, message = auth_manager.save_target_profile(username, stored)
+    if success:
+        for field in BLOB_FIELDS:
+            if _store_keeps_extra_keys is False:
+                prune_blobs(username, field, None)
+            elif ref_field(field) in stored:
+                ref = stored[ref_field(field)]
+                prune_blobs(username, field, ref["version"] if ref else None)
+    return success, message, stored
+
+
+@traced("profile.save_target_profile")
+def save_target_profile(username: str, profile: dict, session: Optional[MutableMapping] = None):
+    """Write ``profile`` through to the store and refresh the cached entry."""
+    with _profile_lock(username):
+        success, message, stored = _store(username, profile)
+    tier = _session_tier(session)
+    if success:
+        cached = _session_get(tier, username) or _shared_get(username) or {}
+        merged = {**cached, **stored}
+        if _store_keeps_extra_keys is False:
+            for field in BLOB_FIELDS:
+                merged.pop(ref_field(field), None)
+        _session_put(tier, username, merged)
+        _shared_put(username, merged)
+    else:
+        invalidate(username, session)
+    return success, message
+
+
+@traced("profile.patch_target_profile")
+def patch_target_profile(username: str, changes: Optional[dict] = None, append: Optional[dict] = None,
+                         expected_version: Optional[int] = None, session: Optional[MutableMapping] = None):
+    """Apply field-level changes to a stored profile.
+
+    ``changes`` replaces the given fields; ``append`` maps list fields such as
+    ``current_skills`` to items that are appended unless already present.
+    When ``expected_version`` is given and the stored profile has moved on,
+    nothing is written and ``(False, message)`` is returned. An explicit
+    ``None`` for a large field clears it along with its blob reference.
+    """
+    with _profile_lock(username):
+        with span("auth_manager.load_target_profile"):
+            current = auth_manager.load_target_profile(username) or {}
+        version = current.get(VERSION_FIELD, 0)
+        check_version = expected_version is not None and _store_keeps_extra_keys is not False
+        if check_version and expected_version != version:
+            invalidate(username, session)
+            return False, "Profile was changed in another tab or window. Reload the page and try again."
+
+        updated = dict(current)
+        updated.update(changes or {})
+        for field in BLOB_FIELDS:
+            if field in (changes or {}) and not changes[field]:
+                updated[ref_field(field)] = None
+        for field, items in (append or {}).items():
+            values = list(updated.get(field) or [])
+            values.extend(item for item in items if item not in values)
+            updated[field] = values
+
+        if updated == current:
+            return True, "No changes to save"
+
+        updated[VERSION_FIELD] = version + 1
+        return save_target_profile(username, updated, session=session)
+
+
+@traced("profile.load_profile_field")
+def load_profile_field(username: str, profile: dict, field: str, session: Optional[MutableMapping] = None):
+    """``profile_blobs.load_profile_field`` for a possibly stale cached ``profile``.
+
+    If another session saved a new version in the meantime, the blob this
+    ``profile`` refers to has been pruned; the profile is then reloaded from
+    the store and the read retried once.
+    """
+    try:
+        return profile_blobs.load_profile_field(username, profile, field)
+    except FileNotFoundError:
+        invalidate(username, session)
+        fresh = load_target_profile(username, session=session)
+        return profile_blobs.load_profile_field(username, fresh, field)
+
+
+def invalidate(username: str, session: Optional[MutableMapping] = None):
+    _session_tier(session).pop(username, None)
+    with _lock:
+        _shared.pop(username, None)
@@ -0,0 +1,155 @@
+# app/services/result_cache.py
+"""Persistent, content-addressed result cache backed by SQLite.
+
+Entries are keyed by a stable hash of their inputs, expire after a TTL and
+are evicted least-recently-used once the cache grows past ``max_entries``.
+Hit/miss counters are kept alongside the entries so they survive restarts
+and are shared by every server process on the host. Only plain JSON values
+are stored; ``set`` refuses anything else rather than caching a lossy copy.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+CACHE_DIR = os.environ.get("RESULT_CACHE_DIR", "data/cache")
+ANALYSIS_CACHE_TTL = int(os.environ.get("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600)))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", "500"))
+RESUME_PARSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESUME_PARSE_CACHE_MAX_ENTRIES", "1000"))
+STAGE_CACHE_MAX_ENTRIES = int(os.environ.get("STAGE_CACHE_MAX_ENTRIES", "2000"))
+# Pipeline input fields that are selections, not sequences; their order never matters
+UNORDERED_FIELDS = ("current_skills", "target_skills", "resume_skills")
+
+
+# ============================================================================
+# KEY HELPERS
+# ============================================================================
+def _normalize(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        items = [_normalize(v) for v in value]
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def stable_hash(*parts) -> str:
+    """SHA-256 of the normalized JSON encoding of ``parts``.
+
+    Strings are stripped and sets are sorted; ``parts`` and lists keep their
+    order. Pass order-insensitive values as sets, e.g. via ``key_inputs``.
+    """
+    payload = json.dumps(_normalize(list(parts)), sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def key_inputs(values: dict) -> dict:
+    """``values`` with the ``UNORDERED_FIELDS`` lists turned into sets, for hashing."""
+    return {
+        name: set(value) if name in UNORDERED_FIELDS and isinstance(value, (list, tuple)) else value
+        for name, value in values.items()
+    }
+
+
+def analysis_cache_key(pipeline_input: dict, resume_text: Optional[str]) -> str:
+    # Skills hash the same in any selection order
+    return stable_hash(key_inputs(pipeline_input), resume_text or "")
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+class ResultCache:
+    def __init__(self, name: str, ttl: Optional[int] = None, max_entries: Optional[int] = None,
+                 cache_dir: str = CACHE_DIR):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.sqlite3")
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, count INTEGER NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _count(self, conn, stat: str):
+        conn.execute(
+            "INSERT INTO stats (name, count) VALUES (?, 1)"
+            " ON CONFLICT(name) DO UPDATE SET count = count + 1",
+            (stat,)
+        )
+
+    def get(self, key: str, default: Any = None, count: bool = True) -> Any:
+        """Cached value for ``key``; ``count=False`` leaves the hit/miss counters alone."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl is not None and row[1] + self.ttl < now:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                if count:
+                    self._count(conn, "misses")
+                return default
+            conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            if count:
+                self._count(conn, "hits")
+            return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> bool:
+        """Store ``value`` under ``key``; returns False, writing nothing, if it isn't plain JSON."""
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            return False
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            if self.ttl is not None:
+                conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+            if self.max_entries is not None:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    " SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        return True
+
+    def invalidate(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            counts = dict(conn.execute("SELECT name, count FROM stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {"hits": counts.get("hits", 0), "misses": counts.get("misses", 0), "entries": entries}
+
+
+analysis_cache = ResultCache("analysis", ttl=ANALYSIS_CACHE_TTL, max_entries=ANALYSIS_CACHE_MAX_ENTRIES)
+resume_parse_cache = ResultCache("resume_parse", max_entries=RESUME_PARSE_CACHE_MAX_ENTRIES)
+stage_cache = ResultCache("pipeline_stages", ttl=ANALYSIS_CACHE_TTL, max_entries=STAGE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,282 @@
+# app/services/resume_stream.py
+"""Streaming, size-bounded resume extraction with section chunking.
+
+PDFs are read one page at a time with ``pypdf``. DOCX files are streamed
+paragraph by paragraph straight out of ``word/document.xml``. Extraction
+stops at whichever of the byte, page or character limits is hit first, so
+the text kept for a request never exceeds ``max_chars``, however large the
+upload is. Files the streaming readers can't handle go through the original
+``parse_and_save_text`` and are cut to the same character limit.
+
+While pages arrive, a ``SectionSplitter`` records where the experience,
+skills and education sections start and end. The result holds the text once,
+plus ``[section, start, end]`` spans over it. Pipeline code iterates the
+sections in bounded chunks, either from memory with
+``ResumeSections.iter_chunks`` or from the resume file with
+``iter_section_chunks``.
+"""
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple
+from xml.etree import ElementTree
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+MAX_RESUME_BYTES = int(os.environ.get("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.environ.get("RESUME_MAX_PAGES", "25"))
+MAX_RESUME_CHARS = int(os.environ.get("RESUME_MAX_CHARS", "100000"))
+CHUNK_CHARS = 4000
+# DOCX has no fixed pages; without an explicit break, this many paragraphs count as one
+DOCX_PARAGRAPHS_PER_PAGE = 45
+
+SECTIONS = ("summary", "experience", "skills", "education", "other")
+SECTION_HEADINGS = {
+    "experience": (
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "projects",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills and tools",
+        "competencies", "core competencies", "technologies", "tools and technologies",
+    ),
+    "education": (
+        "education", "academic background", "qualifications", "education and training",
+        "certifications", "certifications and training", "training",
+    ),
+    "other": (
+        "interests", "hobbies", "languages", "awards", "publications", "volunteering",
+        "references", "additional information",
+    ),
+}
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_RE = re.compile(r"[^a-z ]+")
+MAX_HEADING_CHARS = 40
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ResumeTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class ExtractionLimits:
+    max_bytes: int = MAX_RESUME_BYTES
+    max_pages: int = MAX_RESUME_PAGES
+    max_chars: int = MAX_RESUME_CHARS
+
+
+# ============================================================================
+# SECTIONS
+# ============================================================================
+def heading_section(line: str) -> Optional[str]:
+    """Section that ``line`` opens, if it is a recognised heading."""
+    if len(line) > MAX_HEADING_CHARS:
+        return None
+    key = " ".join(_HEADING_RE.sub(" ", line.casefold().replace("&", "and")).split())
+    return _HEADING_LOOKUP.get(key)
+
+
+class SectionSplitter:
+    """Incrementally assigns fed text to sections; text before any heading is ``summary``."""
+
+    def __init__(self):
+        self.spans = []
+        self._section = "summary"
+        self._start = 0
+        self._pos = 0
+
+    def feed(self, text: str):
+        for line in text.splitlines(keepends=True):
+            section = heading_section(line)
+            if section and section != self._section:
+                self._close()
+                self._section = section
+                self._start = self._pos
+            self._pos += len(line)
+
+    def _close(self):
+        if self._pos > self._start:
+            self.spans.append([self._section, self._start, self._pos])
+
+    def finish(self) -> list:
+        self._close()
+        self._start = self._pos
+        return self.spans
+
+
+def split_sections(text: str) -> list:
+    splitter = SectionSplitter()
+    splitter.feed(text)
+    return splitter.finish()
+
+
+@dataclass
+class ResumeSections:
+    text: str
+    spans: list = field(default_factory=list)
+    pages: int = 0
+    truncated: bool = False
+    # Which limit cut the text short: "pages" or "characters"
+    truncated_by: Optional[str] = None
+
+    def section(self, name: str) -> str:
+        return "".join(self.text[start:end] for section, start, end in self.spans if section == name)
+
+    def iter_chunks(self, max_chars: int = CHUNK_CHARS) -> Iterator[Tuple[str, str]]:
+        """``(section, text)`` pairs of at most ``max_chars`` characters, in document order."""
+        for section, start, end in self.spans:
+            for offset in range(start, end, max_chars):
+                yield section, self.text[offset:min(offset + max_chars, end)]
+
+
+def iter_section_chunks(resume_text_path: str, spans: list,
+                        max_chars: int = CHUNK_CHARS) -> Iterator[Tuple[str, str]]:
+    """Like ``ResumeSections.iter_chunks``, reading the text from a file as it goes."""
+    # newline="" keeps "\r\n" as two characters, matching the offsets in ``spans``
+    with open(resume_text_path, "r", encoding="utf-8", newline="") as f:
+        position = 0
+        for section, start, end in spans:
+            if start > position:
+                f.read(start - position)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(max_chars, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield section, chunk
+            position = end
+
+
+# ============================================================================
+# PAGE READERS
+# ============================================================================
+def _iter_pdf_pages(uploaded_file) -> Iterator[str]:
+    from pypdf import PdfReader
+
+    reader = PdfReader(uploaded_file)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _paragraph_text(paragraph) -> str:
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == _W + "t":
+            parts.append(node.text or "")
+        elif node.tag == _W + "tab":
+            parts.append("\t")
+        elif node.tag == _W + "br" and node.get(_W + "type") != "page":
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _has_page_break(paragraph) -> bool:
+    for node in paragraph.iter():
+        if node.tag == _W + "lastRenderedPageBreak" or (
+                node.tag == _W + "br" and node.get(_W + "type") == "page"):
+            return True
+    return False
+
+
+def _iter_docx_pages(uploaded_file) -> Iterator[str]:
+    with zipfile.ZipFile(uploaded_file) as docx, docx.open("word/document.xml") as document:
+        body = None
+        lines = []
+        for event, element in ElementTree.iterparse(document, events=("start", "end")):
+            if event == "start":
+                if element.tag == _W + "body":
+                    body = element
+                continue
+            if element.tag != _W + "p":
+                continue
+            if _has_page_break(element) and lines:
+                yield "\n".join(lines)
+                lines = []
+            lines.append(_paragraph_text(element))
+            # Drop parsed paragraphs so the tree never holds more than the current one
+            element.clear()
+            if body is not None:
+                body.clear()
+            if len(lines) >= DOCX_PARAGRAPHS_PER_PAGE:
+                yield "\n".join(lines)
+                lines = []
+        if lines:
+            yield "\n".join(lines)
+
+
+def iter_pages(uploaded_file) -> Iterator[str]:
+    """Text of each page of a PDF or DOCX upload, read lazily."""
+    name = uploaded_file.name.lower()
+    uploaded_file.seek(0)
+    if name.endswith(".pdf"):
+        return _iter_pdf_pages(uploaded_file)
+    if name.endswith(".docx"):
+        return _iter_docx_pages(uploaded_file)
+    raise ValueError(f"Unsupported resume format: {uploaded_file.name}")
+
+
+# ============================================================================
+# EXTRACTION
+# ============================================================================
+def _upload_size(uploaded_file) -> int:
+    size = getattr(uploaded_file, "size", None)
+    return size if size is not None else len(uploaded_file.getvalue())
+
+
+def _collect(pages, limits: ExtractionLimits) -> ResumeSections:
+    splitter = SectionSplitter()
+    pieces = []
+    chars = page_count = 0
+    truncated_by = None
+    for page_text in pages:
+        if page_count >= limits.max_pages:
+            truncated_by = "pages"
+            break
+        page_count += 1
+        if chars + len(page_text) > limits.max_chars:
+            page_text = page_text[:limits.max_chars - chars]
+            truncated_by = "characters"
+        elif not page_text.endswith("\n"):
+            page_text += "\n"
+        splitter.feed(page_text)
+        pieces.append(page_text)
+        chars += len(page_text)
+        if truncated_by:
+            break
+    return ResumeSections("".join(pieces), splitter.finish(), page_count,
+                          truncated=truncated_by is not None, truncated_by=truncated_by)
+
+
+def _legacy_pages(uploaded_file, limits: ExtractionLimits) -> Iterator[str]:
+    from app.services.resume_parser import parse_and_save_text
+
+    uploaded_file.seek(0)
+    txt_path = parse_and_save_text(uploaded_file)
+    with open(txt_path, "r", encoding="utf-8") as f:
+        # One past the limit, so truncation is still detected
+        yield f.read(limits.max_chars + 1)
+
+
+def extract_resume(uploaded_file, limits: Optional[ExtractionLimits] = None) -> ResumeSections:
+    """Stream ``uploaded_file`` page by page into a size-bounded ``ResumeSections``.
+
+    Raises ``ResumeTooLarge`` if the upload exceeds ``limits.max_bytes``.
+    """
+    limits = limits or ExtractionLimits()
+    size = _upload_size(uploaded_file)
+    if size > limits.max_bytes:
+        raise ResumeTooLarge(
+            f"Resume is {size / 1024 / 1024:.1f} MB; the limit is {limits.max_bytes / 1024 / 1024:.1f} MB"
+        )
+    try:
+        return _collect(iter_pages(uploaded_file), limits)
+    except Exception:
+        # Missing pypdf, unusual formats and damaged files go through the original parser
+        return _collect(_legacy_pages(uploaded_file, limits), limits)
+
@@ -0,0 +1,91 @@
+# app/services/resume_text.py
+"""Resume text extraction with a content-addressed parse cache.
+
+``parse_resume`` and ``parse_resume_text`` accept anything shaped like a
+Streamlit ``UploadedFile`` (a binary buffer with a ``name``). A file whose
+bytes have been parsed before is served from ``resume_parse_cache`` without
+running PDF/DOCX extraction again. The parser and its document libraries are
+only imported on a cache miss.
+
+By default extraction streams page by page within the limits in
+``resume_stream``. ``RESUME_EXTRACTION=legacy`` restores the original
+whole-document ``parse_and_save_text`` path.
+"""
+import io
+import os
+import time
+
+from app.services.result_cache import content_hash, resume_parse_cache, stable_hash
+from app.services.resume_stream import ExtractionLimits, ResumeSections, extract_resume, split_sections
+from app.services.tracing import span, traced
+
+RESUME_EXTRACTION = os.environ.get("RESUME_EXTRACTION", "streaming")
+
+
+class ResumeFile(io.BytesIO):
+    """In-memory resume with the attributes the parser expects from an upload."""
+
+    def __init__(self, data: bytes, name: str):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+    @classmethod
+    def from_path(cls, path: str) -> "ResumeFile":
+        with open(path, "rb") as f:
+            return cls(f.read(), os.path.basename(path))
+
+
+def _legacy_parse(uploaded_file) -> ResumeSections:
+    # Parse resume and save text
+    from app.services.resume_parser import parse_and_save_text
+    with span("resume_parser.parse_and_save_text"):
+        txt_path = parse_and_save_text(uploaded_file)
+
+    # Read parsed text
+    with open(txt_path, "r", encoding="utf-8") as f:
+        resume_text = f.read()
+    return ResumeSections(resume_text, split_sections(resume_text))
+
+
+@traced("resume.parse_resume")
+def parse_resume(uploaded_file, limits: ExtractionLimits = None) -> ResumeSections:
+    # Hash the upload in place; getvalue() would copy the whole file
+    with uploaded_file.getbuffer() as data:
+        resume_hash = content_hash(data)
+        size_bytes = len(data)
+    if RESUME_EXTRACTION == "legacy":
+        cache_key = resume_hash
+    else:
+        limits = limits or ExtractionLimits()
+        cache_key = stable_hash(resume_hash, limits.max_pages, limits.max_chars)
+
+    cached_parse = resume_parse_cache.get(cache_key)
+    if cached_parse is not None:
+        text = cached_parse["text"]
+        return ResumeSections(text, cached_parse.get("sections") or split_sections(text),
+                              cached_parse.get("pages", 0), cached_parse.get("truncated", False),
+                              cached_parse.get("truncated_by"))
+
+    if RESUME_EXTRACTION == "legacy":
+        parsed = _legacy_parse(uploaded_file)
+    else:
+        with span("resume_stream.extract_resume"):
+            parsed = extract_resume(uploaded_file, limits)
+
+    resume_parse_cache.set(cache_key, {
+        "text": parsed.text,
+        "sections": parsed.spans,
+        "pages": parsed.pages,
+        "truncated": parsed.truncated,
+        "truncated_by": parsed.truncated_by,
+        "filename": uploaded_file.name,
+        "size_bytes": size_bytes,
+        "chars": len(parsed.text),
+        "parsed_at": time.time()
+    })
+    return parsed
+
+
+def parse_resume_text(uploaded_file) -> str:
+    return parse_resume(uploaded_file).text
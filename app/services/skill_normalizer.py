@@ -0,0 +1,156 @@
+# app/services/skill_normalizer.py
+"""Map free-text skills onto canonical taxonomy labels.
+
+Every taxonomy skill is indexed under several folded keys: the bare skill
+name, the full "Category: Skill" label, any parenthesised abbreviation, and
+the aliases from the taxonomy file. Folding lower-cases the text and drops
+spaces and punctuation, so "pytorch", "Py Torch" and
+"Frameworks & Libraries: PyTorch" all land on the same key.
+
+Inputs without an exact key are ranked against a character-trigram index.
+Those fuzzy matches are only offered as suggestions (``suggest``).
+``canonicalize`` never applies them, because a close spelling is often a
+different skill ("Spark SQL" is not "Apache Spark").
+``extract_skills`` finds every taxonomy skill mentioned in a whole document
+in one pass over its tokens.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from app.services.skill_taxonomy import SkillTaxonomy, get_taxonomy, split_label
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+# Lowest score at which a fuzzy match is offered as a suggestion
+MATCH_THRESHOLD = 0.6
+MAX_PHRASE_WORDS = 5
+# Keys this short ("r", "ml", "cv") are only matched in running text when they
+# appear with the same capitalisation as the taxonomy entry
+SHORT_KEY_LENGTH = 2
+
+_FOLD_RE = re.compile(r"[^0-9a-z+#]+")
+_PAREN_RE = re.compile(r"\s*\(([^)]*)\)\s*")
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#]*(?:\.[A-Za-z0-9]+)*")
+
+
+def fold(text: str) -> str:
+    """Case- and punctuation-insensitive lookup key for ``text``."""
+    return _FOLD_RE.sub("", text.casefold().replace("&", "and"))
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# ============================================================================
+# NORMALIZER
+# ============================================================================
+class SkillNormalizer:
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        self.ids_by_key: dict = {}
+        self.case_sensitive: dict = {}
+
+        for skill_id, label in enumerate(taxonomy.labels):
+            _, name = split_label(label)
+            names = [label, name, *taxonomy.aliases.get(label, ())]
+            abbreviation = _PAREN_RE.search(name)
+            if abbreviation:
+                names += [abbreviation.group(1), _PAREN_RE.sub(" ", name)]
+            for alias in names:
+                key = fold(alias)
+                if not key:
+                    continue
+                self.ids_by_key.setdefault(key, skill_id)
+                if len(key) <= SHORT_KEY_LENGTH:
+                    self.case_sensitive.setdefault(key, set()).add(alias.strip())
+
+        self.keys = list(self.ids_by_key)
+        self.key_trigram_counts = [len(_trigrams(key)) for key in self.keys]
+        self.trigram_index: dict = {}
+        for key_index, key in enumerate(self.keys):
+            for gram in _trigrams(key):
+                self.trigram_index.setdefault(gram, []).append(key_index)
+
+    def match(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Ranked ``(label, score)`` candidates for ``text``; 1.0 is exact."""
+        key = fold(text)
+        if not key:
+            return []
+        if key in self.ids_by_key:
+            return [(self.taxonomy.label(self.ids_by_key[key]), 1.0)]
+
+        grams = _trigrams(key)
+        overlaps = Counter()
+        for gram in grams:
+            overlaps.update(self.trigram_index.get(gram, ()))
+
+        # Dice coefficient, keeping the best-scoring key per skill
+        best: dict = {}
+        for key_index, shared in overlaps.items():
+            score = 2.0 * shared / (len(grams) + self.key_trigram_counts[key_index])
+            skill_id = self.ids_by_key[self.keys[key_index]]
+            if score > best.get(skill_id, 0.0):
+                best[skill_id] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(self.taxonomy.label(skill_id), round(score, 3)) for skill_id, score in ranked]
+
+    def canonicalize(self, text: str, threshold: float = 1.0) -> str:
+        """Taxonomy label for ``text`` if it matches a key exactly, otherwise the stripped text.
+
+        Fuzzy matches are not applied unless ``threshold`` is lowered
+        explicitly; use ``suggest`` to offer them instead.
+        """
+        candidates = self.match(text, limit=1)
+        if candidates and candidates[0][1] >= threshold:
+            return candidates[0][0]
+        return text.strip()
+
+    def canonicalize_all(self, skills: Iterable[str], threshold: float = 1.0) -> list:
+        """Canonicalize ``skills``, dropping duplicates while keeping order."""
+        return list(dict.fromkeys(self.canonicalize(skill, threshold) for skill in skills if skill.strip()))
+
+    def suggest(self, text: str, limit: int = 3, threshold: float = MATCH_THRESHOLD) -> list:
+        """Close but inexact taxonomy labels for ``text``, best first; empty on an exact match."""
+        candidates = self.match(text, limit=limit)
+        if candidates and candidates[0][1] >= 1.0:
+            return []
+        return [label for label, score in candidates if score >= threshold]
+
+    def extract_skills(self, text: Optional[str]) -> list:
+        """Every taxonomy label mentioned in ``text``, in order of first mention.
+
+        Word n-grams up to ``MAX_PHRASE_WORDS`` long are folded and looked up in
+        the exact key index, so the cost is linear in the length of the text.
+        """
+        if not text:
+            return []
+        tokens = _TOKEN_RE.findall(text)
+        folded = [fold(token) for token in tokens]
+        found: dict = {}
+        for start in range(len(tokens)):
+            key = ""
+            for end in range(start, min(start + MAX_PHRASE_WORDS, len(tokens))):
+                key += folded[end]
+                skill_id = self.ids_by_key.get(key)
+                if skill_id is None or skill_id in found:
+                    continue
+                if key in self.case_sensitive and " ".join(tokens[start:end + 1]) not in self.case_sensitive[key]:
+                    continue
+                found[skill_id] = None
+        return [self.taxonomy.label(skill_id) for skill_id in found]
+
+
+@lru_cache(maxsize=None)
+def _normalizer_for(taxonomy: SkillTaxonomy) -> SkillNormalizer:
+    return SkillNormalizer(taxonomy)
+
+
+def get_normalizer() -> SkillNormalizer:
+    """The shared normalizer for the process-wide taxonomy."""
+    return _normalizer_for(get_taxonomy())
@@ -0,0 +1,116 @@
+# app/services/skill_taxonomy.py
+"""Process-wide skill taxonomy registry.
+
+The taxonomy (roles, skill categories, aliases and the role -> skills map) is
+loaded once per process from ``skill_taxonomy.json`` and shared by every
+session.
+Skill labels ("Category: Skill") are interned and given integer ids, with
+hash indexes by label, skill name, category and role. Option lists are sorted
+once up front, so page reruns only merge in a user's few custom skills.
+"""
+import heapq
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Iterable, Optional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "skill_taxonomy.json")
+TAXONOMY_PATH = os.environ.get("SKILL_TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+LABEL_SEPARATOR = ": "
+
+
+def make_label(category: str, skill: str) -> str:
+    return sys.intern(f"{category}{LABEL_SEPARATOR}{skill}")
+
+
+def split_label(label: str):
+    """Split "Category: Skill" into ``(category, skill)``; category may be None."""
+    category, sep, skill = label.partition(LABEL_SEPARATOR)
+    return (category, skill) if sep else (None, label)
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+class SkillTaxonomy:
+    def __init__(self, data: dict):
+        self.roles = tuple(sys.intern(role) for role in data.get("roles", []))
+        self.categories = tuple(sys.intern(category) for category in data["categories"])
+
+        labels = []
+        self.ids_by_label: dict = {}
+        self.ids_by_name: dict = {}
+        self.ids_by_category: dict = {}
+        for category, skills in data["categories"].items():
+            category_ids = self.ids_by_category.setdefault(category, [])
+            for skill in skills:
+                label = make_label(category, skill)
+                if label in self.ids_by_label:
+                    continue
+                skill_id = len(labels)
+                labels.append(label)
+                self.ids_by_label[label] = skill_id
+                self.ids_by_name.setdefault(skill.casefold(), []).append(skill_id)
+                category_ids.append(skill_id)
+
+        # Taxonomy order, as the categories are listed in the data file
+        self.labels = tuple(labels)
+        self.sorted_labels = tuple(sorted(labels))
+
+        self.aliases: dict = {
+            label: tuple(names) for label, names in data.get("aliases", {}).items()
+            if label in self.ids_by_label
+        }
+
+        self.role_skill_ids: dict = {}
+        self._role_options: dict = {}
+        for role, role_labels in data.get("role_skills", {}).items():
+            ids = tuple(self.ids_by_label[label] for label in role_labels if label in self.ids_by_label)
+            self.role_skill_ids[sys.intern(role)] = ids
+            self._role_options[role] = tuple(sorted({self.labels[i] for i in ids}))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def is_known(self, label: str) -> bool:
+        return label in self.ids_by_label
+
+    def label(self, skill_id: int) -> str:
+        return self.labels[skill_id]
+
+    def skills_for_role(self, role: Optional[str]) -> tuple:
+        """Role skill labels in data-file order; all skills for unmapped roles."""
+        ids = self.role_skill_ids.get(role)
+        return self.labels if ids is None else tuple(self.labels[i] for i in ids)
+
+    def role_options(self, role: Optional[str]) -> tuple:
+        """Sorted option list for ``role``; all skills for unmapped roles."""
+        return self._role_options.get(role, self.sorted_labels)
+
+    def options_with(self, base: tuple, extra: Optional[Iterable[str]] = None) -> list:
+        """Merge ``extra`` labels into the pre-sorted ``base`` options.
+
+        Only the (usually few) extra labels are sorted, so this is linear in
+        the size of ``base``.
+        """
+        if not extra:
+            return list(base)
+        base_set = self.ids_by_label if base is self.sorted_labels else set(base)
+        extras = sorted({label for label in extra if label not in base_set})
+        return list(heapq.merge(base, extras)) if extras else list(base)
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(path: str = TAXONOMY_PATH) -> SkillTaxonomy:
+    with open(path, "r", encoding="utf-8") as f:
+        return SkillTaxonomy(json.load(f))
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """The shared registry, loaded on first use and reused by every session."""
+    return load_taxonomy(TAXONOMY_PATH)
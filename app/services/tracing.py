@@ -0,0 +1,184 @@
+# app/services/tracing.py
+"""Lightweight span tracing for the analysis hot path.
+
+Spans are timed with ``span()`` (a context manager), ``traced()`` (a
+decorator) or ``start_span()``/``Span.end()`` for code that can't be wrapped
+in a block, such as a whole page script. Finished spans are appended as JSON
+lines to a size-rotated file, and ``recent_stats()`` summarizes them into
+per-name p50/p95 latencies.
+
+Tracing is off unless ``TRACING_ENABLED`` is set. When it is off, ``traced``
+returns the function unchanged, and ``span``/``start_span`` hand back a shared
+no-op object.
+"""
+import contextvars
+import json
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "").lower() in ("1", "true", "yes")
+TRACE_FILE = os.environ.get("TRACE_FILE", "data/traces/spans.jsonl")
+TRACE_FILE_MAX_BYTES = int(os.environ.get("TRACE_FILE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_FILE_BACKUPS = 3
+ADMIN_USERS = {name.strip() for name in os.environ.get("ADMIN_USERS", "").split(",") if name.strip()}
+
+_trace_id = contextvars.ContextVar("trace_id", default=None)
+_logger = None
+
+
+def _span_logger() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        os.makedirs(os.path.dirname(TRACE_FILE) or ".", exist_ok=True)
+        logger = logging.getLogger("career_coach.spans")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        if not logger.handlers:
+            handler = RotatingFileHandler(TRACE_FILE, maxBytes=TRACE_FILE_MAX_BYTES,
+                                          backupCount=TRACE_FILE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+        _logger = logger
+    return _logger
+
+
+# ============================================================================
+# SPANS
+# ============================================================================
+class Span:
+    __slots__ = ("name", "attrs", "trace_id", "started_at", "_start", "_token", "_ended")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = _trace_id.get()
+        self._token = None
+        self._ended = False
+        if self.trace_id is None:
+            self.trace_id = uuid.uuid4().hex[:16]
+            self._token = _trace_id.set(self.trace_id)
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+
+    def end(self, error: Optional[BaseException] = None):
+        """Record the span; calls after the first are ignored."""
+        if self._ended:
+            return
+        self._ended = True
+        duration_ms = (time.perf_counter() - self._start) * 1000
+        if self._token is not None:
+            _trace_id.reset(self._token)
+            self._token = None
+        record = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "start": round(self.started_at, 6),
+            "duration_ms": round(duration_ms, 3),
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if error is not None:
+            record["error"] = type(error).__name__
+        _span_logger().info(json.dumps(record, default=str))
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def end(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def start_span(name: str, **attrs):
+    """Start a span that the caller ends explicitly with ``.end()``."""
+    return Span(name, attrs) if TRACING_ENABLED else _NOOP_SPAN
+
+
+@contextmanager
+def _timed(name: str, attrs: dict):
+    active = Span(name, attrs)
+    try:
+        yield active
+    except BaseException as e:
+        active.end(error=e)
+        raise
+    active.end()
+
+
+def span(name: str, **attrs):
+    """Time the enclosed block as span ``name``."""
+    return _timed(name, attrs) if TRACING_ENABLED else _NOOP_SPAN
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of ``span``; a no-op when tracing is disabled."""
+    def decorator(fn):
+        if not TRACING_ENABLED:
+            return fn
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timed(span_name, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def recent_stats(limit: int = 2000) -> list:
+    """Per-span-name count, p50 and p95 over the last ``limit`` spans."""
+    if not os.path.exists(TRACE_FILE):
+        return []
+    with open(TRACE_FILE, "r", encoding="utf-8") as f:
+        lines = deque(f, maxlen=limit)
+
+    durations = defaultdict(list)
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        durations[record["name"]].append(record["duration_ms"])
+
+    rows = []
+    for name, values in sorted(durations.items()):
+        values.sort()
+        rows.append({
+            "span": name,
+            "count": len(values),
+            "p50_ms": round(_percentile(values, 0.5), 1),
+            "p95_ms": round(_percentile(values, 0.95), 1),
+        })
+    return rows
+
+
+def is_admin(username: Optional[str]) -> bool:
+    return TRACING_ENABLED and username in ADMIN_USERS
@@ -0,0 +1,57 @@
+# app/services/warmup.py
+"""Background preloading of the heavy agent and parser modules.
+
+The goals page imports the orchestrator and the resume parser only when an
+analysis is submitted, so the first paint never waits for the LLM clients or
+the PDF/DOCX libraries. ``start_warmup`` then imports those modules on a
+daemon thread once per process, and they are usually loaded by the time the
+first user submits. If a user submits before warm-up finishes, Python's
+import lock makes their import wait for the one in progress rather than
+running it a second time.
+"""
+import importlib
+import os
+import threading
+
+from app.services.tracing import span
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+WARMUP_ENABLED = os.environ.get("WARMUP_ENABLED", "1").lower() in ("1", "true", "yes")
+WARMUP_MODULES = (
+    "app.agents.orchestrator",
+    "app.services.resume_parser",
+    "pypdf",
+)
+
+_lock = threading.Lock()
+_thread = None
+
+
+# ============================================================================
+# WARM-UP
+# ============================================================================
+def _preload(modules):
+    for name in modules:
+        try:
+            with span("warmup.import", module=name):
+                importlib.import_module(name)
+        except Exception:
+            # A module that fails here fails again, with the same error, at its point of use
+            pass
+
+
+def start_warmup(modules=WARMUP_MODULES) -> bool:
+    """Preload ``modules`` on a background thread; only the first call per process starts it."""
+    global _thread
+    if not WARMUP_ENABLED:
+        return False
+    with _lock:
+        if _thread is not None:
+            return False
+        _thread = threading.Thread(target=_preload, args=(tuple(modules),), name="module-warmup", daemon=True)
+        _thread.start()
+    return True
+
@@ -0,0 +1,117 @@
+# benchmarks/corpus.py
+"""Deterministic synthetic inputs for the benchmarks.
+
+Resumes are generated as real PDF and DOCX files (hand-assembled, so no
+document libraries are needed to create them), and taxonomies can be scaled
+up to tens of thousands of skills.
+"""
+import io
+import random
+import zipfile
+from xml.sax.saxutils import escape
+
+SECTION_TITLES = ["Experience", "Skills", "Education", "Projects", "Certifications"]
+WORDS = (
+    "built deployed designed analysed optimised pipelines models dashboards services "
+    "customers revenue latency throughput team stakeholders data platform cloud "
+    "Python SQL PyTorch TensorFlow Docker Kubernetes AWS Spark Kafka Tableau Excel "
+    "statistics forecasting experimentation APIs React Node.js Git Agile"
+).split()
+
+
+def resume_lines(pages: int, lines_per_page: int = 45, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    lines = []
+    for page in range(pages):
+        for line in range(lines_per_page):
+            if line % 15 == 0:
+                lines.append(SECTION_TITLES[(page + line // 15) % len(SECTION_TITLES)])
+            else:
+                lines.append(" ".join(rng.choice(WORDS) for _ in range(12)))
+    return lines
+
+
+def make_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """A valid multi-page PDF with one Helvetica text stream per page."""
+    lines = resume_lines(pages, lines_per_page)
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in range(pages):
+        chunk = lines[page * lines_per_page:(page + 1) * lines_per_page]
+        text = "".join(
+            f"({line.replace(chr(92), '').replace('(', '').replace(')', '')}) Tj T* " for line in chunk
+        )
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(pages: int, lines_per_page: int = 45) -> bytes:
+    """A minimal but valid DOCX with one paragraph per line."""
+    paragraphs = "".join(
+        f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in resume_lines(pages, lines_per_page)
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        )
+        docx.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="word/document.xml"/></Relationships>'
+        )
+        docx.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def scaled_taxonomy(base: dict, target_skills: int, seed: int = 11) -> dict:
+    """``base`` padded with generated categories until it holds ``target_skills`` skills."""
+    rng = random.Random(seed)
+    data = {key: (dict(value) if isinstance(value, dict) else value) for key, value in base.items()}
+    categories = {category: list(skills) for category, skills in base["categories"].items()}
+    count = sum(len(skills) for skills in categories.values())
+    index = 0
+    while count < target_skills:
+        category = f"Generated Category {index // 500}"
+        stem = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+        categories.setdefault(category, []).append(f"{stem.title()} Skill {index}")
+        index += 1
+        count += 1
+    data["categories"] = categories
+    return data
@@ -0,0 +1,121 @@
+# benchmarks/import_report.py
+"""Import-time report for a page's first render.
+
+Collects the imports a page script runs unconditionally at module level and
+times them in a fresh interpreter with ``python -X importtime``. Imports made
+inside functions or branches, like the submit handler's lazy imports, are left
+out because a first render doesn't run them. The check fails if any of those
+imports fails, if any module in ``--forbid`` is loaded (by default the modules
+``app.services.warmup`` preloads in the background), or if the total exceeds
+``--budget-ms``.
+
+    python -m benchmarks.import_report
+    python -m benchmarks.import_report --script startup.py --budget-ms 800 --output imports.json
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+from app.services.warmup import WARMUP_MODULES
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRIPT = "pages/career_coach.py"
+
+_PROBE = """
+import importlib, json, sys
+failed = {}
+for name in sys.argv[1:]:
+    try:
+        importlib.import_module(name)
+    except Exception as e:
+        failed[name] = f"{type(e).__name__}: {e}"
+print(json.dumps(failed))
+"""
+
+
+def module_level_imports(path: str) -> list:
+    """Modules imported by top-level statements of ``path``, in source order."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def measure_imports(modules: list) -> tuple:
+    """Run ``-X importtime`` on ``modules``; returns (rows, failed imports)."""
+    path = os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, *modules],
+        cwd=ROOT_DIR, capture_output=True, text=True, env=dict(os.environ, PYTHONPATH=path)
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    stdout = result.stdout.strip().splitlines()
+    failed = json.loads(stdout[-1]) if stdout else {"<probe>": result.stderr.strip()[-500:]}
+    return rows, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import cost of a page's first render.")
+    parser.add_argument("--script", default=DEFAULT_SCRIPT, help="Page script, relative to the repo root")
+    parser.add_argument("--forbid", nargs="*", default=list(WARMUP_MODULES),
+                        help="Modules that must not be imported on first render")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the total import time exceeds this")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    requested = module_level_imports(os.path.join(ROOT_DIR, args.script))
+    rows, failed = measure_imports(requested)
+    total_ms = sum(row["cumulative_ms"] for row in rows if row["depth"] == 0)
+    loaded = {row["module"] for row in rows}
+    forbidden = [name for name in args.forbid if name in loaded]
+
+    print(f"{args.script}: {len(rows)} modules imported in {total_ms:.1f} ms")
+    for name in requested:
+        row = next((r for r in rows if r["module"] == name), None)
+        if row:
+            print(f"  {name:56s} {row['cumulative_ms']:9.1f} ms")
+    print(f"slowest {args.top} by self time:")
+    for row in sorted(rows, key=lambda r: r["self_ms"], reverse=True)[:args.top]:
+        print(f"  {row['module']:56s} {row['self_ms']:9.1f} ms")
+    for name, error in failed.items():
+        print(f"IMPORT FAILED {name}: {error}", file=sys.stderr)
+    for name in forbidden:
+        print(f"FORBIDDEN {name} is imported on first render", file=sys.stderr)
+    over_budget = args.budget_ms is not None and total_ms > args.budget_ms
+    if over_budget:
+        print(f"OVER BUDGET {total_ms:.1f} ms > {args.budget_ms:.1f} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "script": args.script,
+                "requested": requested,
+                "total_ms": round(total_ms, 3),
+                "failed": failed,
+                "forbidden": forbidden,
+                "modules": rows,
+            }, f, indent=2)
+    return 1 if failed or forbidden or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
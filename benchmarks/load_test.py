@@ -0,0 +1,302 @@
+# benchmarks/load_test.py
+"""Multi-session load test for the Career Goals page.
+
+Each simulated session is a Streamlit ``AppTest`` that logs in, edits its
+goals, adds custom skills and runs analyses against the stub orchestrator
+from ``stub_pipeline``. N sessions run concurrently in one process, which is
+how a single server process serves them. The report covers:
+
+- rerun latency per step (p50/p95/max)
+- session state size per session, including the ``analysis`` result
+- peak resident memory growth per session
+- analysis and rerun throughput
+
+    python -m benchmarks.load_test --sessions 8
+    python -m benchmarks.load_test --sessions 32 --analyses 3 --output load.json
+
+AppTest swaps in a process-wide mock runtime for each script run, so two
+sessions can't rerun at the same instant. Session threads take turns through
+``_RUN_LOCK``. Their analyses still run concurrently on the job pool, as they
+would on a real server. Rerun latency is measured inside the lock, and time
+spent waiting for it is reported separately as ``rerun_wait``.
+
+Sessions go through ``startup.py`` navigation when every page it registers
+is present. Otherwise they drive ``pages/career_coach.py`` directly. Login is
+simulated by seeding ``logged_in``/``username``. AppTest can't upload files,
+so each user's profile is seeded with resume text instead.
+"""
+import argparse
+import json
+import os
+import pickle
+import platform
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+# Importing run_benchmarks points the caches, blobs and locks at a temp directory
+from benchmarks import stub_pipeline
+from benchmarks.corpus import resume_lines
+from benchmarks.run_benchmarks import _install_memory_profile_store
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_SCRIPT = os.path.join(ROOT_DIR, "startup.py")
+GOALS_PAGE = "pages/career_coach.py"
+NAVIGATION_PAGES = ["pages/profile.py", GOALS_PAGE, "pages/skills_dashboard.py", "pages/analysis_dashboard.py"]
+DASHBOARD_PAGE = "pages/analysis_dashboard.py"
+TIMEFRAMES = ["3 months", "6 months", "1 year"]
+
+_RUN_LOCK = threading.Lock()
+
+
+# ============================================================================
+# SETUP
+# ============================================================================
+def _install_stubs() -> str:
+    try:
+        import app.services.auth_manager  # noqa: F401
+        profile_backend = "auth_manager"
+    except ImportError:
+        _install_memory_profile_store()
+        profile_backend = "in-memory stub"
+    stub_pipeline.install()
+    return profile_backend
+
+
+def _seed_profile(username: str, resume_pages: int):
+    from app.services.profile_cache import save_target_profile
+
+    save_target_profile(username, {
+        "target_role": "Data Scientist",
+        "current_skills": ["Programming Languages: Python", "Databases: SQL"],
+        "target_skills": [],
+        "learning_mode": "Self-paced",
+        "timeframe": "6 months",
+        "motivation": f"Load test user {username}",
+        "resume_filename": "resume.pdf",
+        "resume_parsed_text": "\n".join(resume_lines(resume_pages)),
+    })
+
+
+def _use_navigation() -> bool:
+    return all(os.path.exists(os.path.join(ROOT_DIR, page)) for page in NAVIGATION_PAGES)
+
+
+# ============================================================================
+# SESSION
+# ============================================================================
+def _state_size(at) -> tuple:
+    """Pickled size of the session state, and of the ``analysis`` entry alone."""
+    total = analysis = 0
+    for key, value in at.session_state.items():
+        try:
+            size = len(pickle.dumps(value))
+        except Exception:
+            continue
+        total += size
+        if key == "analysis":
+            analysis = size
+    return total, analysis
+
+
+def _timed_run(at, run, timings: dict, step: str):
+    waiting = time.perf_counter()
+    with _RUN_LOCK:
+        start = time.perf_counter()
+        run()
+        timings[step].append((time.perf_counter() - start) * 1000)
+    timings["rerun_wait"].append((start - waiting) * 1000)
+
+    if at.exception:
+        messages = [e.message for e in at.exception]
+        # The dashboard page only exists under startup.py navigation; reaching it means the analysis finished
+        if not all(DASHBOARD_PAGE in message for message in messages) or "analysis" not in at.session_state:
+            raise RuntimeError(f"{step}: {messages[0]}")
+
+
+def _rerun(at, timings: dict, step: str):
+    _timed_run(at, at.run, timings, step)
+
+
+def _submit(at, timings: dict, step: str):
+    button = next(b for b in at.button if b.label != "Logout")
+    _timed_run(at, lambda: button.click().run(), timings, step)
+
+
+def run_session(index: int, args, navigation: bool) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    username = f"load_user_{index}"
+    _seed_profile(username, args.resume_pages)
+    timings = defaultdict(list)
+    started = time.perf_counter()
+
+    if navigation:
+        at = AppTest.from_file(STARTUP_SCRIPT, default_timeout=args.timeout)
+    else:
+        at = AppTest.from_file(os.path.join(ROOT_DIR, GOALS_PAGE), default_timeout=args.timeout)
+    at.session_state["logged_in"] = True
+    at.session_state["username"] = username
+    if navigation:
+        at.switch_page(GOALS_PAGE)
+    _rerun(at, timings, "render")
+
+    for n in range(args.skills):
+        at.text_input(key="new_current_skill").input(f"Load Skill {index}-{n}")
+        _submit(at, timings, "add_skill")
+        _rerun(at, timings, "render")
+
+    analyses = 0
+    for n in range(args.analyses):
+        previous = at.session_state["analysis"] if "analysis" in at.session_state else None
+        if navigation and n:
+            at.switch_page(GOALS_PAGE)
+            _rerun(at, timings, "render")
+        at.text_input(key="new_current_skill").input("")
+        timeframe = next(s for s in at.selectbox if s.label == "Expected Timeframe")
+        timeframe.select(TIMEFRAMES[(index + n) % len(TIMEFRAMES)])
+        _submit(at, timings, "submit_analysis")
+
+        deadline = time.monotonic() + args.timeout
+        while True:
+            current = at.session_state["analysis"] if "analysis" in at.session_state else None
+            if current is not None and current is not previous:
+                analyses += 1
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"analysis {n} for {username} did not finish in {args.timeout}s")
+            time.sleep(args.poll_interval)
+            _rerun(at, timings, "progress_poll")
+
+    state_bytes, analysis_bytes = _state_size(at)
+    return {
+        "timings": timings,
+        "analyses": analyses,
+        "duration_s": time.perf_counter() - started,
+        "state_bytes": state_bytes,
+        "analysis_bytes": analysis_bytes,
+    }
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+def _distribution(values: list) -> dict:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(statistics.median(values), 2),
+        "p95_ms": round(values[min(len(values) - 1, int(0.95 * len(values)))], 2),
+        "max_ms": round(values[-1], 2),
+    }
+
+
+def _peak_rss_kb() -> int:
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def summarize(sessions: list, errors: list, wall_s: float, rss_growth_kb: int, args, navigation: bool) -> dict:
+    by_step = defaultdict(list)
+    for session in sessions:
+        for step, values in session["timings"].items():
+            by_step[step].extend(values)
+    reruns = sum(len(values) for values in by_step.values())
+    analyses = sum(session["analyses"] for session in sessions)
+    count = max(1, len(sessions))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "entry": "startup.py" if navigation else GOALS_PAGE,
+        "sessions": args.sessions,
+        "completed_sessions": len(sessions),
+        "errors": errors,
+        "model_latency_s": stub_pipeline.MODEL_LATENCY_SECONDS,
+        "wall_s": round(wall_s, 3),
+        "throughput": {
+            "analyses_per_s": round(analyses / wall_s, 3),
+            "reruns_per_s": round(reruns / wall_s, 3),
+        },
+        "rerun_latency": {step: _distribution(values) for step, values in sorted(by_step.items()) if values},
+        "memory": {
+            "state_kb_mean": round(sum(s["state_bytes"] for s in sessions) / count / 1024, 1),
+            "state_kb_max": round(max((s["state_bytes"] for s in sessions), default=0) / 1024, 1),
+            "analysis_kb_mean": round(sum(s["analysis_bytes"] for s in sessions) / count / 1024, 1),
+            "peak_rss_growth_kb_per_session": round(rss_growth_kb / count, 1),
+        },
+    }
+
+
+def print_report(report: dict):
+    print(f"entry {report['entry']}   sessions {report['completed_sessions']}/{report['sessions']}   "
+          f"wall {report['wall_s']:.2f}s   model latency {report['model_latency_s'] * 1000:.0f}ms")
+    for step, stats in report["rerun_latency"].items():
+        print(f"{step:20s} n={stats['count']:5d}   p50 {stats['p50_ms']:9.1f} ms   "
+              f"p95 {stats['p95_ms']:9.1f} ms   max {stats['max_ms']:9.1f} ms")
+    memory = report["memory"]
+    print(f"session state {memory['state_kb_mean']:.1f} KB mean / {memory['state_kb_max']:.1f} KB max   "
+          f"analysis {memory['analysis_kb_mean']:.1f} KB mean   "
+          f"peak RSS growth {memory['peak_rss_growth_kb_per_session']:.1f} KB/session")
+    throughput = report["throughput"]
+    print(f"throughput {throughput['analyses_per_s']:.2f} analyses/s   {throughput['reruns_per_s']:.2f} reruns/s")
+    for error in report["errors"]:
+        print(f"ERROR {error}", file=sys.stderr)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run concurrent simulated sessions against the goals page.")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--skills", type=int, default=2, help="Custom skills each session adds")
+    parser.add_argument("--analyses", type=int, default=2, help="Analyses each session runs")
+    parser.add_argument("--resume-pages", type=int, default=3, help="Size of each seeded resume")
+    parser.add_argument("--model-latency", type=float, help="Stub model latency per call, in seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.25, help="Seconds between progress reruns")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-rerun and per-analysis timeout")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+    _install_stubs()
+    if args.model_latency is not None:
+        stub_pipeline.MODEL_LATENCY_SECONDS = args.model_latency
+    navigation = _use_navigation()
+
+    sessions, errors = [], []
+    lock = threading.Lock()
+
+    def worker(index):
+        try:
+            result = run_session(index, args, navigation)
+        except Exception as e:
+            with lock:
+                errors.append(f"session {index}: {e}")
+            return
+        with lock:
+            sessions.append(result)
+
+    rss_before = _peak_rss_kb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        list(pool.map(worker, range(args.sessions)))
+    wall_s = time.perf_counter() - start
+    report = summarize(sessions, errors, wall_s, _peak_rss_kb() - rss_before, args, navigation)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
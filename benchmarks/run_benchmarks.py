@@ -0,0 +1,283 @@
+# benchmarks/run_benchmarks.py
+"""Offline benchmark suite for the analysis hot path.
+
+Covers resume parsing (including the peak memory of streaming extraction),
+profile load/save round trips, taxonomy and skill
+normalization at scaled-up sizes, and the end-to-end pipeline against the
+deterministic stub model in ``stub_pipeline``. All state goes to a temporary
+directory, and no model or network calls are made.
+
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --save-baseline
+    python -m benchmarks.run_benchmarks --baseline benchmarks/baseline.json --threshold 0.25
+
+With a baseline, any benchmark whose median is more than ``--threshold``
+slower than the baseline is reported as a regression, and the exit code is 1.
+"""
+import argparse
+import atexit
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+# Keep caches, blobs and locks out of the real data directory; the app modules
+# read these at import time, so they must be set before anything is imported
+_WORK_DIR = tempfile.mkdtemp(prefix="career_coach_bench_")
+atexit.register(shutil.rmtree, _WORK_DIR, ignore_errors=True)
+os.environ.setdefault("RESULT_CACHE_DIR", os.path.join(_WORK_DIR, "cache"))
+os.environ.setdefault("PROFILE_BLOB_DIR", os.path.join(_WORK_DIR, "blobs"))
+os.environ.setdefault("ADMISSION_LOCK_DIR", os.path.join(_WORK_DIR, "locks"))
+
+from benchmarks import stub_pipeline  # noqa: E402
+from benchmarks.corpus import make_docx, make_pdf, resume_lines, scaled_taxonomy  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+def measure(fn, repeat: int = 5, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(0.95 * len(timings)))], 4),
+        "runs": repeat,
+    }
+
+
+def peak_memory_kb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def _install_memory_profile_store():
+    """In-memory stand-in for auth_manager when the real store is unavailable."""
+    store = {}
+    module = types.ModuleType("app.services.auth_manager")
+
+    def load_target_profile(username):
+        record = store.get(username)
+        return json.loads(record) if record else {}
+
+    def save_target_profile(username, profile):
+        store[username] = json.dumps(profile, default=str)
+        return True, "Profile saved"
+
+    module.load_target_profile = load_target_profile
+    module.save_target_profile = save_target_profile
+    sys.modules["app.services.auth_manager"] = module
+
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+def bench_parse(results: dict, quick: bool):
+    try:
+        from app.services.resume_parser import parse_and_save_text
+    except ImportError as e:
+        print(f"skipping parse benchmarks: {e}", file=sys.stderr)
+        return
+    from app.services.resume_text import ResumeFile, parse_resume_text
+
+    for pages in ([1, 5] if quick else [1, 5, 20, 50]):
+        for kind, data in (("pdf", make_pdf(pages)), ("docx", make_docx(pages))):
+            resume = ResumeFile(data, f"resume_{pages}p.{kind}")
+            results[f"parse.{kind}.{pages}p"] = measure(lambda: parse_and_save_text(ResumeFile(data, resume.name)),
+                                                        repeat=3)
+            parse_resume_text(resume)
+            results[f"parse.{kind}.{pages}p.cached"] = measure(lambda: parse_resume_text(resume))
+
+
+def bench_stream(results: dict, quick: bool):
+    from app.services.resume_stream import extract_resume
+    from app.services.resume_text import ResumeFile
+
+    for pages in ([1, 50] if quick else [1, 5, 20, 50, 200]):
+        for kind, data in (("pdf", make_pdf(pages)), ("docx", make_docx(pages))):
+            name = f"resume_{pages}p.{kind}"
+            try:
+                extract_resume(ResumeFile(data, name))
+            except ImportError as e:
+                print(f"skipping stream.{kind}: {e}", file=sys.stderr)
+                continue
+            stats = measure(lambda: extract_resume(ResumeFile(data, name)), repeat=3)
+            # Upload bytes are excluded; only what extraction itself allocates is counted
+            stats["peak_kb"] = peak_memory_kb(lambda: extract_resume(ResumeFile(data, name)))
+            results[f"stream.{kind}.{pages}p"] = stats
+
+
+def bench_profile_io(results: dict, quick: bool):
+    from app.services import profile_cache
+
+    for size_kb in ([4, 256] if quick else [4, 64, 256, 1024]):
+        username = f"bench_{size_kb}kb"
+        analysis = {"roadmap": ["x" * 1000] * size_kb, "skill_gap": list(range(size_kb * 10))}
+        profile = {
+            "target_role": "Data Scientist",
+            "current_skills": ["Programming Languages: Python"] * 20,
+            "target_skills": ["Frameworks & Libraries: PyTorch"] * 20,
+            "resume_parsed_text": "\n".join(resume_lines(max(1, size_kb // 8))),
+            "analysis_output": analysis,
+        }
+        profile_cache.save_target_profile(username, profile)
+
+        def cold_load():
+            profile_cache.invalidate(username)
+            profile_cache.load_target_profile(username)
+
+        session = {}
+        results[f"profile.save.{size_kb}kb"] = measure(lambda: profile_cache.save_target_profile(username, profile))
+        results[f"profile.load_cold.{size_kb}kb"] = measure(cold_load)
+        results[f"profile.load_session.{size_kb}kb"] = measure(
+            lambda: profile_cache.load_target_profile(username, session=session)
+        )
+        # A new skill every run, warm-up included, so each patch actually writes
+        skill_numbers = itertools.count(1)
+        results[f"profile.patch_append.{size_kb}kb"] = measure(
+            lambda: profile_cache.patch_target_profile(
+                username, append={"current_skills": [f"Custom Skill {next(skill_numbers)}"]}
+            )
+        )
+
+
+def bench_taxonomy(results: dict, quick: bool):
+    from app.services.skill_normalizer import SkillNormalizer
+    from app.services.skill_taxonomy import DEFAULT_TAXONOMY_PATH, SkillTaxonomy
+
+    with open(DEFAULT_TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    resume_text = "\n".join(resume_lines(5))
+    custom = ["My Custom Skill", "Another One", "Internal Tool"]
+
+    for size in ([60, 5000] if quick else [60, 5000, 50000]):
+        data = scaled_taxonomy(base, size)
+        results[f"taxonomy.build.{size}"] = measure(lambda: SkillTaxonomy(data), repeat=3)
+        taxonomy = SkillTaxonomy(data)
+        stored = list(taxonomy.labels[:30]) + custom
+        results[f"taxonomy.custom_filter.{size}"] = measure(
+            lambda: [s for s in stored if not taxonomy.is_known(s)]
+        )
+        results[f"taxonomy.options_with.{size}"] = measure(
+            lambda: taxonomy.options_with(taxonomy.sorted_labels, custom)
+        )
+        results[f"normalizer.build.{size}"] = measure(lambda: SkillNormalizer(taxonomy), repeat=3)
+        normalizer = SkillNormalizer(taxonomy)
+        results[f"normalizer.match_fuzzy.{size}"] = measure(lambda: normalizer.match("Kubernets"), repeat=50)
+        results[f"normalizer.extract_5p_resume.{size}"] = measure(lambda: normalizer.extract_skills(resume_text))
+
+
+def bench_pipeline(results: dict, quick: bool):
+    from app.agents.pipeline_adapters import build_pipeline_input, run_pipeline_on_text
+
+    resume_text = "\n".join(resume_lines(3))
+    pipeline_input = build_pipeline_input(
+        {}, "Data Scientist", ["Python", "SQL"], ["PyTorch"], "Self-paced", "", "6 months", resume_text
+    )
+    for latency in ([0.01] if quick else [0.01, 0.05, 0.2]):
+        stub_pipeline.MODEL_LATENCY_SECONDS = latency
+        label = f"{int(latency * 1000)}ms_model"
+        results[f"pipeline.cold.{label}"] = measure(
+            lambda: run_pipeline_on_text(pipeline_input, resume_text, use_cache=False, force_refresh=True),
+            repeat=3
+        )
+        run_pipeline_on_text(pipeline_input, resume_text)
+        # Every run, warm-up included, asks for a timeframe not seen before, so the
+        # roadmap stage always recomputes on top of the cached upstream stages
+        timeframes = (f"{weeks} weeks ({label})" for weeks in itertools.count(1))
+        results[f"pipeline.timeframe_change.{label}"] = measure(
+            lambda: run_pipeline_on_text(dict(pipeline_input, timeframe=next(timeframes)), resume_text), repeat=3
+        )
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous and current["median_ms"] > previous["median_ms"] * (1 + threshold):
+            regressions.append((name, previous["median_ms"], current["median_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--only", choices=["parse", "stream", "profile", "taxonomy", "pipeline"], action="append")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    try:
+        import app.services.auth_manager  # noqa: F401
+        profile_backend = "auth_manager"
+    except ImportError:
+        _install_memory_profile_store()
+        profile_backend = "in-memory stub"
+    stub_pipeline.install()
+
+    groups = {
+        "parse": bench_parse,
+        "stream": bench_stream,
+        "profile": bench_profile_io,
+        "taxonomy": bench_taxonomy,
+        "pipeline": bench_pipeline,
+    }
+    results = {}
+    for name, bench in groups.items():
+        if not args.only or name in args.only:
+            bench(results, args.quick)
+
+    for name, stats in results.items():
+        peak = f"   peak {stats['peak_kb']:10.1f} KB" if "peak_kb" in stats else ""
+        print(f"{name:48s} median {stats['median_ms']:10.3f} ms   p95 {stats['p95_ms']:10.3f} ms{peak}")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile_backend": profile_backend,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# benchmarks/stub_pipeline.py
+"""Offline stand-in for ``app.agents.orchestrator``.
+
+``run_agentic_pipeline`` here has the same signature as the real one, but its
+agents call ``StubModel``. The stub returns deterministic text derived from
+the prompt after a configurable latency, so a benchmark measures the
+orchestration, caching and I/O around the model rather than the model itself.
+Like a real orchestrator should, it reads the resume one section chunk at a
+time and never loads the whole file.
+"""
+import hashlib
+import os
+import sys
+import time
+import types
+
+from app.agents.stage_graph import Stage, StageGraph
+from app.services.resume_stream import iter_section_chunks, split_sections
+
+MODEL_LATENCY_SECONDS = float(os.environ.get("STUB_MODEL_LATENCY", "0.05"))
+
+
+class StubModel:
+    def __init__(self, latency: float = None):
+        self.latency = MODEL_LATENCY_SECONDS if latency is None else latency
+
+    def complete(self, prompt: str) -> str:
+        time.sleep(self.latency)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return f"stub-{digest[:12]}"
+
+
+def build_graph(model: StubModel) -> StageGraph:
+    return StageGraph([
+        Stage("profile", lambda c: model.complete(c["resume_digest"]), reads=("resume_digest",)),
+        Stage("requirements", lambda c: model.complete(c["target_role"]), reads=("target_role",)),
+        Stage("skill_gap", lambda c: model.complete(f"{c['profile']}|{c['requirements']}|{c['current_skills']}"),
+              depends_on=("profile", "requirements"), reads=("current_skills", "target_skills")),
+        Stage("roadmap", lambda c: model.complete(f"{c['skill_gap']}|{c['timeframe']}|{c['learning_mode']}"),
+              depends_on=("skill_gap",), reads=("timeframe", "learning_mode")),
+    ])
+
+
+def run_agentic_pipeline(pipeline_input: dict, resume_text_path: str, use_cache: bool = True,
+                         force_refresh: bool = False, model: StubModel = None):
+    from app.services.result_cache import stage_cache
+
+    spans = pipeline_input.get("resume_sections")
+    if spans is None:
+        with open(resume_text_path, "r", encoding="utf-8", newline="") as f:
+            spans = split_sections(f.read())
+    digest = hashlib.sha256()
+    for section, chunk in iter_section_chunks(resume_text_path, spans):
+        digest.update(f"{section}:".encode("utf-8"))
+        digest.update(chunk.encode("utf-8"))
+
+    context = dict(pipeline_input, resume_digest=digest.hexdigest())
+    build_graph(model or StubModel()).run(
+        context, cache=stage_cache if use_cache else None, refresh=force_refresh
+    )
+    context.pop("resume_digest")
+    return context
+
+
+def install():
+    """Register this module as ``app.agents.orchestrator`` for the current process."""
+    module = types.ModuleType("app.agents.orchestrator")
+    module.run_agentic_pipeline = run_agentic_pipeline
+    sys.modules["app.agents.orchestrator"] = module
@@ -0,0 +1,257 @@
+# cohort_analysis.py
+"""Bulk skill analysis for a cohort of users.
+
+Reads a manifest (CSV or JSONL) with one row per user, parses each resume and
+runs the agent pipeline across a process pool, then writes target profiles
+and analysis outputs back through the profile store in batches. Finished
+users are recorded in a checkpoint file, so re-running the same command
+resumes where an interrupted run stopped.
+
+Pipeline runs take a slot from ``admission.pipeline_slots`` like the web app's
+jobs do, so a cohort run on a live host stays within MAX_CONCURRENT_PIPELINES.
+Failures are recorded per user, including a worker process that crashed or a
+profile save that raised, and the rest of the cohort keeps going.
+
+Manifest fields: username, target_role, resume (path to a PDF/DOCX), and
+optionally current_skills, target_skills, learning_mode, timeframe,
+motivation. In CSV files, skill lists are separated with ";".
+
+    python cohort_analysis.py cohort.csv --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+def _as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value).split(";") if v.strip()]
+
+
+def read_manifest(path: str) -> list:
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    items = []
+    for row in rows:
+        resume = row.get("resume") or ""
+        items.append({
+            "username": row["username"].strip(),
+            "target_role": row["target_role"].strip(),
+            "resume": os.path.join(base_dir, resume) if resume and not os.path.isabs(resume) else resume,
+            "current_skills": _as_list(row.get("current_skills")),
+            "target_skills": _as_list(row.get("target_skills")),
+            "learning_mode": row.get("learning_mode") or "Self-paced",
+            "timeframe": row.get("timeframe") or "6 months",
+            "motivation": row.get("motivation") or "",
+        })
+    return items
+
+
+def read_checkpoint(path: str) -> set:
+    done = set()
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    if record.get("status") == "ok":
+                        done.add(record["username"])
+    return done
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+def error_result(item: dict, started: float, error: BaseException) -> dict:
+    return {
+        "username": item["username"],
+        "status": "error",
+        "seconds": round(time.perf_counter() - started, 3),
+        "error": f"{type(error).__name__}: {error}",
+        "traceback": "".join(traceback.format_exception(type(error), error, error.__traceback__)),
+    }
+
+
+def analyze_item(item: dict, refresh: bool = False) -> dict:
+    """Parse one resume and run the pipeline; runs in a worker process."""
+    from app.agents.pipeline_adapters import build_pipeline_input, run_pipeline_single_flight
+    from app.services.admission import key_lock, pipeline_slots
+    from app.services.profile_cache import load_target_profile
+    from app.services.result_cache import analysis_cache_key
+    from app.services.resume_text import ResumeFile, parse_resume_text
+    from app.services.skill_normalizer import get_normalizer
+
+    started = time.perf_counter()
+    try:
+        resume_file = ResumeFile.from_path(item["resume"])
+        resume_text = parse_resume_text(resume_file)
+        profile = load_target_profile(item["username"])
+        pipeline_input = build_pipeline_input(
+            profile, item["target_role"], item["current_skills"], item["target_skills"],
+            item["learning_mode"], item["motivation"], item["timeframe"], resume_text
+        )
+        cache_key = analysis_cache_key(pipeline_input, resume_text)
+        # Wait for an identical run before taking a slot, not while holding one
+        with key_lock(cache_key), pipeline_slots.acquire():
+            context = run_pipeline_single_flight(
+                cache_key,
+                pipeline_input,
+                resume_text,
+                refresh=refresh,
+                use_cache=not refresh,
+                force_refresh=refresh
+            )
+        return {
+            "username": item["username"],
+            "status": "ok",
+            "seconds": round(time.perf_counter() - started, 3),
+            "changes": {
+                "target_role": item["target_role"],
+                "motivation": item["motivation"],
+                "current_skills": get_normalizer().canonicalize_all(item["current_skills"]),
+                "target_skills": get_normalizer().canonicalize_all(item["target_skills"]),
+                "learning_mode": item["learning_mode"],
+                "timeframe": item["timeframe"],
+                "resume_parsed_text": resume_text,
+                "resume_filename": resume_file.name,
+                "analysis_output": context,
+            },
+        }
+    except Exception as e:
+        return error_result(item, started, e)
+
+
+# ============================================================================
+# WRITE-BACK
+# ============================================================================
+def write_batch(batch: list, checkpoint_path: str) -> list:
+    """Save a batch of finished results and record them in the checkpoint."""
+    from app.services.profile_cache import patch_target_profile
+
+    records = []
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        for result in batch:
+            record = {key: value for key, value in result.items() if key != "changes"}
+            if result["status"] == "ok":
+                try:
+                    success, message = patch_target_profile(result["username"], result["changes"])
+                except Exception as e:
+                    success, message = False, f"{type(e).__name__}: {e}"
+                    record["traceback"] = traceback.format_exc()
+                if not success:
+                    record.update(status="error", error=f"Save failed: {message}")
+            checkpoint.write(json.dumps(record) + "\n")
+            records.append(record)
+        checkpoint.flush()
+        os.fsync(checkpoint.fileno())
+    return records
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+def run_cohort(manifest: str, workers: int, batch_size: int, checkpoint_path: str, refresh: bool) -> dict:
+    items = read_manifest(manifest)
+    done = read_checkpoint(checkpoint_path)
+    todo = [item for item in items if item["username"] not in done]
+
+    started = time.perf_counter()
+    counts = {"total": len(items), "skipped": len(items) - len(todo), "ok": 0, "error": 0}
+    batch = []
+
+    def flush():
+        for record in write_batch(batch, checkpoint_path):
+            counts[record["status"]] += 1
+        batch.clear()
+
+    queue = iter(todo)
+    running = {}
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    # Keep at most 2x workers submitted so huge manifests don't pile up in memory
+    def refill():
+        while len(running) < workers * 2:
+            item = next(queue, None)
+            if item is None:
+                break
+            running[executor.submit(analyze_item, item, refresh)] = (item, time.perf_counter())
+
+    def collect(future):
+        item, submitted = running.pop(future)
+        try:
+            result = future.result()
+        except Exception as e:
+            result = error_result(item, submitted, e)
+        batch.append(result)
+        if result["status"] == "error":
+            print(f"[error] {result['username']}: {result['error']}", file=sys.stderr)
+
+    try:
+        refill()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = any(isinstance(future.exception(), BrokenProcessPool) for future in finished)
+            if broken:
+                # A crashed worker fails every in-flight item; record them all and start a fresh pool
+                finished = set(running)
+                wait(finished)
+            for future in finished:
+                collect(future)
+            if broken:
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+            if len(batch) >= batch_size:
+                flush()
+            refill()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if batch:
+            flush()
+
+    elapsed = time.perf_counter() - started
+    counts["seconds"] = round(elapsed, 2)
+    counts["per_minute"] = round((counts["ok"] + counts["error"]) / elapsed * 60, 2) if elapsed else 0.0
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run skill analysis for a cohort of users.")
+    parser.add_argument("manifest", help="CSV or JSONL manifest of users")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Worker processes")
+    parser.add_argument("--batch-size", type=int, default=25, help="Results saved per write batch")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <manifest>.checkpoint.jsonl)")
+    parser.add_argument("--force-refresh", action="store_true", help="Ignore cached analyses")
+    args = parser.parse_args(argv)
+
+    checkpoint_path = args.checkpoint or f"{args.manifest}.checkpoint.jsonl"
+    summary = run_cohort(args.manifest, max(1, args.workers), max(1, args.batch_size),
+                         checkpoint_path, args.force_refresh)
+
+    print(
+        f"{summary['ok']} analysed, {summary['error']} failed, {summary['skipped']} already done "
+        f"of {summary['total']} in {summary['seconds']}s ({summary['per_minute']} users/min)"
+    )
+    print(f"Errors are recorded in {checkpoint_path}")
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
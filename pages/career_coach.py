@@ -2,16 +2,33 @@
 import io
 import time
 import streamlit as st
-from app.services.auth_manager import save_target_profile, load_target_profile
-from app.services.resume_parser import parse_and_save_text
-from app.agents.orchestrator import run_agentic_pipeline
+from app.services.profile_cache import load_target_profile, load_profile_field, patch_target_profile
+from app.services.profile_blobs import has_profile_field
+from app.services.skill_taxonomy import get_taxonomy
+from app.services.skill_normalizer import get_normalizer
+from app.services.job_manager import submit_job, get_job, find_active_job, discard_job, cancel_job, CANCELLED
+from app.services.result_cache import analysis_cache, analysis_cache_key
+from app.services.tracing import start_span, recent_stats, is_admin
+ 
+page_span = start_span("page.career_coach")
+ 
+ 
+def rerun():
+    # st.rerun and st.switch_page never return, so the page span is ended before them
+    page_span.end()
+    st.rerun()
+ 
+ 
+def switch_page(page: str):
+    page_span.end()
+    st.switch_page(page)
  
  
 # ============================================================================
 # AUTHENTICATION CHECK
 # ============================================================================
 if "logged_in" not in st.session_state or not st.session_state.logged_in:
-    st.switch_page("pages/login.py")
+    switch_page("pages/login.py")
  
  
 # ============================================================================
@@ -50,7 +67,16 @@ with st.sidebar:
     if st.button("Logout", width='stretch'):
         for key in list(st.session_state.keys()):
             del st.session_state[key]
-        st.rerun()
+        rerun()
+   
+    # Admin-only latency breakdown of recent runs
+    if is_admin(st.session_state.username):
+        with st.expander("Timing (recent runs)"):
+            timing_rows = recent_stats()
+            if timing_rows:
+                st.dataframe(timing_rows, hide_index=True)
+            else:
+                st.caption("No spans recorded yet")
  
  
 # ============================================================================
@@ -64,7 +90,7 @@ st.divider()
 # ============================================================================
 # LOAD TARGET PROFILE FROM DATABASE
 # ============================================================================
-profile = load_target_profile(st.session_state.username)
+profile = load_target_profile(st.session_state.username, session=st.session_state)
  
 if "form_key_counter" not in st.session_state:
     st.session_state.form_key_counter = 0
@@ -73,114 +99,9 @@ if "form_key_counter" not in st.session_state:
 # ============================================================================
 # STATIC OPTIONS CONFIGURATION
 # ============================================================================
-ALL_ROLES = [
-    "Select Target Role",
-    "Data Analyst",
-    "Data Scientist",
-    "Machine Learning Engineer",
-    "Data Engineer",
-    "AI Researcher",   # change JSON key from ML Researcher → AI Researcher
-    "Software Developer",
-    "Full Stack Developer",
-    "Product Manager",
-    "DevOps Engineer",
-    "Cloud Architect",  # add this to JSON
-    "Cybersecurity Specialist",  # add this to JSON
-    "BI Developer",
-    "Prompt Engineer / GenAI Specialist"  # add this to JSON
-]
- 
- 
-# Structured taxonomy of skills
-SKILL_TAXONOMY = {
-    "Programming Languages": [
-        "Python", "R", "Java", "C++", "JavaScript", "SQL", "Scala"
-    ],
-    "Machine Learning & AI": [
-        "Machine Learning", "Deep Learning", "Natural Language Processing (NLP)",
-        "Generative AI", "Computer Vision", "Reinforcement Learning",
-        "Feature Engineering", "Model Deployment", "MLOps"
-    ],
-    "Data Engineering": [
-        "ETL", "Data Pipelines", "Apache Spark", "Kafka",
-        "Hadoop", "Data Warehousing", "Data Wrangling"
-    ],
-    "Cloud & DevOps": [
-        "AWS", "Azure", "GCP",
-        "Docker", "Kubernetes", "Terraform", "CI/CD", "Linux"
-    ],
-    "Data Visualization & BI": [
-        "Power BI", "Tableau", "Excel", "Matplotlib", "Seaborn", "Plotly", "Dash"
-    ],
-    "Frameworks & Libraries": [
-        "TensorFlow", "PyTorch", "Scikit-learn", "Keras",
-        "Pandas", "NumPy", "OpenCV", "NLTK", "Hugging Face Transformers"
-    ],
-    "Software Development": [
-        "React", "Node.js", "Flask", "Django", "Git", "APIs", "Agile Methodology"
-    ],
-    "Other Technical Skills": [
-        "Statistics", "Data Analysis", "Big Data", "Prompt Engineering",
-        "Cybersecurity", "System Design"
-    ]
-}
- 
-# Flatten taxonomy with category prefix for UI
-FLATTENED_SKILLS = []
-for category, skills in SKILL_TAXONOMY.items():
-    FLATTENED_SKILLS.extend([f"{category}: {skill}" for skill in skills])
- 
-# Role → Skills map aligned to taxonomy
-ROLE_SKILLS_MAP = {
-    "Data Analyst": [
-        "Programming Languages: SQL", "Programming Languages: Python",
-        "Data Visualization & BI: Power BI", "Data Visualization & BI: Tableau",
-        "Data Visualization & BI: Excel", "Other Technical Skills: Statistics"
-    ],
-    "Data Scientist": [
-        "Programming Languages: Python", "Machine Learning & AI: Machine Learning",
-        "Machine Learning & AI: Deep Learning", "Machine Learning & AI: Natural Language Processing (NLP)",
-        "Machine Learning & AI: Feature Engineering", "Frameworks & Libraries: Scikit-learn",
-        "Frameworks & Libraries: Pandas", "Frameworks & Libraries: NumPy"
-    ],
-    "Machine Learning Engineer": [
-        "Programming Languages: Python", "Machine Learning & AI: Deep Learning",
-        "Frameworks & Libraries: TensorFlow", "Frameworks & Libraries: PyTorch",
-        "Machine Learning & AI: MLOps", "Machine Learning & AI: Model Deployment",
-        "Cloud & DevOps: AWS", "Cloud & DevOps: Azure", "Cloud & DevOps: GCP",
-        "Cloud & DevOps: Docker", "Cloud & DevOps: Kubernetes", "Cloud & DevOps: CI/CD"
-    ],
-    "Data Engineer": [
-        "Programming Languages: SQL", "Programming Languages: Python",
-        "Data Engineering: ETL", "Data Engineering: Data Pipelines",
-        "Data Engineering: Apache Spark", "Data Engineering: Kafka",
-        "Cloud & DevOps: AWS", "Cloud & DevOps: Docker", "Cloud & DevOps: Kubernetes"
-    ],
-    "AI Researcher": [
-        "Programming Languages: Python", "Machine Learning & AI: Deep Learning",
-        "Machine Learning & AI: Generative AI", "Machine Learning & AI: Natural Language Processing (NLP)",
-        "Frameworks & Libraries: PyTorch", "Machine Learning & AI: Computer Vision",
-        "Machine Learning & AI: Reinforcement Learning", "Other Technical Skills: Statistics"
-    ],
-    "Software Developer": [
-        "Programming Languages: Python", "Programming Languages: JavaScript",
-        "Software Development: React", "Software Development: Node.js",
-        "Software Development: Git", "Software Development: APIs",
-        "Software Development: Agile Methodology"
-    ],
-    "Full Stack Developer": [
-        "Programming Languages: JavaScript", "Programming Languages: Python",
-        "Software Development: React", "Software Development: Node.js",
-        "Software Development: Django", "Software Development: Flask",
-        "Programming Languages: SQL", "Software Development: Git"
-    ],
-    "Prompt Engineer / GenAI Specialist": [
-        "Other Technical Skills: Prompt Engineering", "Machine Learning & AI: Generative AI",
-        "Machine Learning & AI: Natural Language Processing (NLP)", "Programming Languages: Python",
-        "Frameworks & Libraries: Hugging Face Transformers"
-    ],
-    "Select Target Role": FLATTENED_SKILLS
-}
+# Roles and skills come from the shared taxonomy registry, loaded once per process
+TAXONOMY = get_taxonomy()
+ALL_ROLES = ["Select Target Role", *TAXONOMY.roles]
  
 LEARNING_MODES = ["Self-paced", "Mentor-led", "Bootcamp", "Hybrid"]
 TIMEFRAMES = ["3 months", "6 months", "1 year", "Flexible"]
@@ -190,15 +111,32 @@ TIMEFRAMES = ["3 months", "6 months", "1 year", "Flexible"]
 # HELPER FUNCTIONS
 # ============================================================================
 def normalize_skill(skill: str) -> str:
-    return skill.strip()
+    # Fold case, spacing and aliases onto the canonical taxonomy label; close spellings are only suggested
+    return get_normalizer().canonicalize(skill)
  
  
-def merge_skill_lists(*skill_lists):
-    merged = set()
-    for skill_list in skill_lists:
-        if skill_list:
-            merged.update(skill_list)
-    return sorted(merged)
+def suggestion_for(field: str, skill: str):
+    candidates = get_normalizer().suggest(skill)
+    return {"field": field, "value": skill, "candidates": candidates} if candidates else None
+ 
+ 
+def replace_custom_skill(field: str, value: str, label: str):
+    skills = list(dict.fromkeys(label if s == value else s for s in profile.get(field, [])))
+    return patch_target_profile(
+        st.session_state.username, {field: skills},
+        expected_version=profile.get("profile_version", 0), session=st.session_state
+    )
+ 
+ 
+def finish_analysis(context):
+    # Save analysis output to profile
+    patch_target_profile(st.session_state.username, {"analysis_output": context}, session=st.session_state)
+   
+    # Store analysis results in session
+    st.session_state.analysis = context
+   
+    # Redirect to dashboard
+    switch_page("pages/analysis_dashboard.py")
  
  
 # ============================================================================
@@ -207,14 +145,9 @@ def merge_skill_lists(*skill_lists):
 stored_current_skills = profile.get("current_skills", [])
 stored_target_skills = profile.get("target_skills", [])
  
-custom_current_skills = [s for s in stored_current_skills if s not in FLATTENED_SKILLS]
-custom_target_skills = [s for s in stored_target_skills if s not in FLATTENED_SKILLS]
- 
-all_current_skills = merge_skill_lists(FLATTENED_SKILLS, custom_current_skills)
-all_target_skills = merge_skill_lists(
-    ROLE_SKILLS_MAP.get(profile.get("target_role", "Select Target Role"), FLATTENED_SKILLS),
-    custom_target_skills
-)
+# Every stored skill must be an option, or st.multiselect rejects its default.
+# Target options depend on the role, so known skills from other roles count as extras too
+all_current_skills = TAXONOMY.options_with(TAXONOMY.sorted_labels, stored_current_skills)
  
  
 # ============================================================================
@@ -272,8 +205,7 @@ with st.form(form_key, clear_on_submit=False):
         new_current_skill = st.text_input("Add custom current skill", key="new_current_skill")
         st.markdown("---")
         st.markdown("**Target Skills to Learn**")
-        role_specific_skills = ROLE_SKILLS_MAP.get(target_role, FLATTENED_SKILLS)
-        all_target_skills_for_role = merge_skill_lists(role_specific_skills, custom_target_skills)
+        all_target_skills_for_role = TAXONOMY.options_with(TAXONOMY.role_options(target_role), stored_target_skills)
         selected_target_skills = st.multiselect(
             "Skills to learn or improve",
             all_target_skills_for_role,
@@ -289,8 +221,12 @@ with st.form(form_key, clear_on_submit=False):
     if uploaded_resume is None and profile.get("resume_filename"):
         st.info(f"Using previously uploaded: **{profile.get('resume_filename')}**")
    
-    has_resume = uploaded_resume or profile.get("resume_parsed_text")
+    has_resume = uploaded_resume or has_profile_field(profile, "resume_parsed_text")
     button_text = "Generate Skill Analysis" if has_resume else "Save Career Goals"
+    force_refresh = st.checkbox(
+        "Force refresh analysis",
+        help="Re-run the analysis even if an identical one was generated before"
+    ) if has_resume else False
     col_left, col_center, col_right = st.columns([1, 2, 1])
     with col_center:
         submitted = st.form_submit_button(button_text, width='stretch')
@@ -304,72 +240,77 @@ if submitted:
     # Handle custom skill addition
     if new_current_skill.strip() or new_target_skill.strip():
        
-        # Load existing profile to merge with
-        existing_profile = load_target_profile(st.session_state.username)
-       
-        # Start with existing data
-        updated_profile = {
-            "target_role": existing_profile.get("target_role"),
-            "motivation": existing_profile.get("motivation"),
-            "current_skills": existing_profile.get("current_skills", []).copy(),
-            "target_skills": existing_profile.get("target_skills", []).copy(),
-            "learning_mode": existing_profile.get("learning_mode"),
-            "timeframe": existing_profile.get("timeframe"),
-            "custom_timeframe_months": existing_profile.get("custom_timeframe_months"),
-            "resume_parsed_text": existing_profile.get("resume_parsed_text"),
-            "resume_filename": existing_profile.get("resume_filename"),
-            "analysis_output": existing_profile.get("analysis_output")
-        }
+        skills_to_add = {}
        
         # Add new current skill
         if new_current_skill.strip():
-            normalized_current = normalize_skill(new_current_skill)
-            if normalized_current not in updated_profile["current_skills"]:
-                updated_profile["current_skills"].append(normalized_current)
+            skills_to_add["current_skills"] = [normalize_skill(new_current_skill)]
        
         # Add new target skill
         if new_target_skill.strip():
-            normalized_target = normalize_skill(new_target_skill)
-            if normalized_target not in updated_profile["target_skills"]:
-                updated_profile["target_skills"].append(normalized_target)
+            skills_to_add["target_skills"] = [normalize_skill(new_target_skill)]
        
-        # Save complete profile
-        success, message = save_target_profile(st.session_state.username, updated_profile)
+        # Skills saved as typed that are close to a taxonomy skill get a "did you mean" prompt
+        suggestions = [suggestion_for(field, skills[0]) for field, skills in skills_to_add.items()]
+       
+        # Append only the new skills; existing fields are left untouched
+        success, message = patch_target_profile(
+            st.session_state.username, append=skills_to_add, session=st.session_state
+        )
        
         if success:
             st.success("Custom skills added successfully!")
+            st.session_state.skill_suggestions = [s for s in suggestions if s]
             st.session_state.form_key_counter += 1
             time.sleep(0.5)
-            st.rerun()
+            rerun()
         else:
             st.error(f"Failed to add custom skills: {message}")
    
     # Handle main form submission
     elif target_role != "Select Target Role":
+        # Imported here so that viewing or saving goals never loads the parser or agents
+        from app.services.resume_text import parse_resume
+        from app.agents.pipeline_adapters import build_pipeline_input, run_pipeline_single_flight
        
-        # Parse resume if newly uploaded
-        resume_parsed_text = profile.get("resume_parsed_text")
+        # Parse resume if newly uploaded, otherwise fetch the stored text
+        resume_parsed_text = None
         resume_filename = profile.get("resume_filename")
        
-        if uploaded_resume is not None:
+        if uploaded_resume is None:
             try:
-                # Parse resume and save text
-                txt_path = parse_and_save_text(uploaded_resume)
-               
-                # Read parsed text
-                with open(txt_path, 'r', encoding='utf-8') as f:
-                    resume_parsed_text = f.read()
+                resume_parsed_text = load_profile_field(
+                    st.session_state.username, profile, "resume_parsed_text", session=st.session_state
+                )
+            except OSError as e:
+                st.error(f"Could not load your saved resume, please upload it again: {str(e)}")
+                resume_parsed_text = None
+        else:
+            try:
+                # Known files are served from the parse cache without re-extraction
+                parsed_resume = parse_resume(uploaded_resume)
+                resume_parsed_text = parsed_resume.text
                
                 resume_filename = uploaded_resume.name
                 st.success(f"Resume parsed: {resume_filename}")
+                if parsed_resume.truncated_by == "pages":
+                    st.warning(
+                        f"Your resume is very long, so only its first {parsed_resume.pages} pages "
+                        f"were used for the analysis"
+                    )
+                elif parsed_resume.truncated:
+                    st.warning(
+                        f"Your resume is very long, so only its first {len(resume_parsed_text):,} "
+                        f"characters were used for the analysis"
+                    )
                
             except Exception as e:
                 st.error(f"Error parsing resume: {str(e)}")
                 resume_parsed_text = None
                 resume_filename = None
        
-        # Prepare complete profile data
-        updated_profile = {
+        # Prepare the fields edited in the form
+        profile_changes = {
             "target_role": target_role,
             "motivation": motivation,
             "current_skills": selected_current_skills,
@@ -377,13 +318,18 @@ if submitted:
             "learning_mode": learning_mode,
             "timeframe": final_timeframe,
             "custom_timeframe_months": custom_timeframe_months,
-            "resume_parsed_text": resume_parsed_text,
-            "resume_filename": resume_filename,
-            "analysis_output": profile.get("analysis_output")  # Preserve existing analysis
         }
+        if uploaded_resume is not None:
+            profile_changes["resume_parsed_text"] = resume_parsed_text
+            profile_changes["resume_filename"] = resume_filename
        
-        # Save to database
-        success, message = save_target_profile(st.session_state.username, updated_profile)
+        # Save to database, unless another tab saved since this form was rendered
+        success, message = patch_target_profile(
+            st.session_state.username,
+            profile_changes,
+            expected_version=profile.get("profile_version", 0),
+            session=st.session_state
+        )
        
         if not success:
             st.error(f"Failed to save profile: {message}")
@@ -391,56 +337,35 @@ if submitted:
             # If resume exists, run AI analysis
             if resume_parsed_text:
                 try:
-                    status_placeholder = st.empty()
-                   
-                    analysis_steps = [
-                        "Analyzing your profile...",
-                        "Analyzing your skills...",
-                        "Generating personalized roadmap..."
-                    ]
-                   
-                    for step in analysis_steps:
-                        status_placeholder.info(step)
-                        time.sleep(5)
-                   
                     # Prepare pipeline input
-                    pipeline_input = {
-                        "role": profile.get("current_role", ""),  # ✅ current role from profile
-                        "target_role": target_role,
-                        "current_skills": selected_current_skills,
-                        "target_skills": selected_target_skills,
-                        "experience": profile.get("experience", "N/A"),  # ✅ ensure experience is passed
-                        "learning_mode": learning_mode,
-                        "motivation": motivation,
-                        "timeframe": final_timeframe,
-                    }
+                    pipeline_input = build_pipeline_input(
+                        profile, target_role, selected_current_skills, selected_target_skills,
+                        learning_mode, motivation, final_timeframe, resume_parsed_text
+                    )
                                        
-                    # Run AI analysis pipeline
-                    resume_path_for_pipeline = txt_path if uploaded_resume else "data/text.txt"
- 
-                    # If no new upload but we have saved text, write it back to file
-                    if not uploaded_resume and profile.get("resume_parsed_text"):
-                        with open(resume_path_for_pipeline, "w", encoding="utf-8") as f:
-                            f.write(profile["resume_parsed_text"])
- 
-                    context = run_agentic_pipeline(
+                    # Reuse a previous result for identical input and resume
+                    cache_key = analysis_cache_key(pipeline_input, resume_parsed_text)
+                    cached_context = None if force_refresh else analysis_cache.get(cache_key)
+                    if cached_context is not None:
+                        finish_analysis(cached_context)
+ 
+                    # Run the pipeline in the background on the in-memory resume text;
+                    # a double-click or second tab attaches to the run already in flight.
+                    # Progress is polled below
+                    st.session_state.analysis_job_id = submit_job(
+                        run_pipeline_single_flight,
+                        cache_key,
                         pipeline_input,
-                        resume_text_path=resume_path_for_pipeline,
-                        use_cache=False,
-                        force_refresh=True
+                        resume_parsed_text,
+                        refresh=force_refresh,
+                        use_cache=not force_refresh,
+                        force_refresh=force_refresh,
+                        cache_checked=True,
+                        owner=st.session_state.username,
+                        dedupe_key=(st.session_state.username, cache_key),
+                        lock_key=cache_key
                     )
- 
- 
-                   
-                    # Save analysis output to profile
-                    updated_profile["analysis_output"] = context
-                    save_target_profile(st.session_state.username, updated_profile)
-                   
-                    # Store analysis results in session
-                    st.session_state.analysis = context
-                   
-                    # Redirect to dashboard
-                    st.switch_page("pages/analysis_dashboard.py")
+                    rerun()
                
                 except Exception as e:
                     st.error("Error analyzing resume")
@@ -453,3 +378,75 @@ if submitted:
     else:
         st.warning("Please select a target role before proceeding")
  
+ 
+# ============================================================================
+# CUSTOM SKILL SUGGESTIONS
+# ============================================================================
+for index, suggestion in enumerate(list(st.session_state.get("skill_suggestions", []))):
+    st.info(f"**{suggestion['value']}** was saved as a custom skill. Did you mean one of these?")
+    suggestion_cols = st.columns(len(suggestion["candidates"]) + 1)
+    chosen = None
+    for col, label in zip(suggestion_cols, suggestion["candidates"]):
+        if col.button(label, key=f"skill_suggestion_{index}_{label}"):
+            chosen = label
+    dismissed = suggestion_cols[-1].button("Keep as entered", key=f"skill_suggestion_{index}_keep")
+   
+    if chosen or dismissed:
+        if chosen:
+            success, message = replace_custom_skill(suggestion["field"], suggestion["value"], chosen)
+            if not success:
+                st.error(f"Failed to update skill: {message}")
+                continue
+        st.session_state.skill_suggestions.remove(suggestion)
+        st.session_state.form_key_counter += 1
+        rerun()
+ 
+ 
+# ============================================================================
+# BACKGROUND ANALYSIS PROGRESS
+# ============================================================================
+# Pick up a running job after a rerun or a reconnect, or deliver one that finished while the user was away
+if "analysis_job_id" not in st.session_state:
+    active_job = find_active_job(st.session_state.username)
+    if active_job is not None:
+        st.session_state.analysis_job_id = active_job.job_id
+ 
+ 
+@st.fragment(run_every=1.0)
+def show_analysis_progress():
+    job = get_job(st.session_state.get("analysis_job_id"))
+    if job is None:
+        st.session_state.pop("analysis_job_id", None)
+        return
+ 
+    if not job.finished:
+        st.info(job.latest_message or "Analyzing your profile...")
+       
+        # Show each agent's output as soon as it finishes
+        for stage, output in job.partial_results().items():
+            with st.expander(f"{stage.replace('_', ' ').title()} ready", expanded=False):
+                st.write(output)
+       
+        if st.button("Cancel analysis", key="cancel_analysis"):
+            cancel_job(job.job_id)
+        return
+ 
+    st.session_state.pop("analysis_job_id", None)
+    discard_job(job.job_id)
+ 
+    if job.status == CANCELLED:
+        st.info("Analysis cancelled")
+        return
+ 
+    if job.error is not None:
+        st.error("Error analyzing resume")
+        st.exception(job.error)
+        return
+ 
+    finish_analysis(job.result)
+ 
+ 
+if "analysis_job_id" in st.session_state:
+    show_analysis_progress()
+ 
+page_span.end()
@@ -1,5 +1,6 @@
 # startup.py
 import streamlit as st
+from app.services.warmup import start_warmup
 
 st.set_page_config(
     page_title="Career Trajectory Coach",
@@ -7,6 +8,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Load the agent and parser modules in the background, once per server process
+start_warmup()
+
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 